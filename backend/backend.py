@@ -1,9 +1,79 @@
+import asyncio
+import json
+import os
+from contextlib import asynccontextmanager
+from typing import List, Optional
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from pydantic import BaseModel
-from rhea_python_chatbot import RHEAHealthBot
+from fastapi.responses import JSONResponse, PlainTextResponse, StreamingResponse
+from pydantic import BaseModel, Field
+from rhea_python_chatbot import RHEAHealthBot, SessionStore
+
+# 'background' serves the fallback corpus immediately and swaps in live data when ready,
+# 'blocking' waits for the WHO/MOHFW scrape before accepting traffic
+STARTUP_MODE = os.environ.get("RHEA_STARTUP_MODE", "background")
+# Longest wait between scheduler passes; each source is refetched on its own cadence.
+# 0 refreshes only once at startup
+REFRESH_INTERVAL = float(os.environ.get("RHEA_REFRESH_INTERVAL", "3600"))
+# With RHEA_SNAPSHOT_DIR set, workers never scrape: `python rhea-python-chatbot.py --refresher`
+# publishes corpus snapshots there and each worker checks for a new one this often
+SNAPSHOT_POLL = float(os.environ.get("RHEA_SNAPSHOT_POLL", "5"))
+# Largest /chat/batch request; longer replays are sent as several batches
+MAX_BATCH_SIZE = int(os.environ.get("RHEA_MAX_BATCH_SIZE", "100"))
+# Edits to the knowledge pack go live within this many seconds; 0 only reloads on POST /knowledge/reload
+KNOWLEDGE_POLL = float(os.environ.get("RHEA_KNOWLEDGE_POLL", "30"))
+
+bot = RHEAHealthBot()
+sessions = SessionStore(
+    max_sessions=int(os.environ.get("RHEA_MAX_SESSIONS", "10000")),
+    ttl=float(os.environ.get("RHEA_SESSION_TTL", "1800")),
+)
 
-app = FastAPI()
+async def refresh_loop(refresh_now: bool):
+    # Each pass fetches only the sources that are due and rewrites only the articles that changed
+    while True:
+        if refresh_now:
+            await asyncio.to_thread(bot.refresh_health_data)
+        if REFRESH_INTERVAL <= 0:
+            return
+        refresh_now = True
+        await asyncio.sleep(max(1.0, min(REFRESH_INTERVAL, bot.next_refresh_delay())))
+
+async def snapshot_loop():
+    while True:
+        await asyncio.to_thread(bot.load_snapshot)
+        await asyncio.sleep(SNAPSHOT_POLL)
+
+async def knowledge_loop():
+    while True:
+        await asyncio.sleep(KNOWLEDGE_POLL)
+        await asyncio.to_thread(bot.reload_knowledge_if_changed)
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    if bot.snapshot is not None:
+        # Until the refresher publishes, /ready reports 503
+        if STARTUP_MODE == "blocking":
+            while not bot.load_snapshot():
+                await asyncio.sleep(SNAPSHOT_POLL)
+        refresh_task = asyncio.create_task(snapshot_loop())
+    else:
+        if STARTUP_MODE == "blocking":
+            bot.get_health_data()
+        else:
+            # A file-backed corpus from an earlier run or another worker is served while it revalidates
+            if bot.data_source == "empty":
+                bot.load_fallback_data()
+        refresh_task = asyncio.create_task(refresh_loop(STARTUP_MODE != "blocking"))
+    knowledge_task = asyncio.create_task(knowledge_loop()) if KNOWLEDGE_POLL > 0 else None
+    yield
+    for task in (refresh_task, knowledge_task):
+        if task is not None and not task.done():
+            task.cancel()
+    bot.close()
+
+app = FastAPI(lifespan=lifespan)
 
 # Allow frontend to connect
 app.add_middleware(
@@ -14,13 +84,59 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-bot = RHEAHealthBot()
-bot.get_health_data()
-
 class Query(BaseModel):
     message: str
+    session_id: Optional[str] = None
+    stream: bool = False
+
+async def stream_events(query: Query, session):
+    # Server-sent events: one 'chunk' per response section, then 'done'
+    async for chunk in bot.stream_message_async(query.message, session):
+        yield f"event: chunk\ndata: {json.dumps({'text': chunk}, ensure_ascii=False)}\n\n"
+    done = {"session_id": session.session_id, "language": session.language}
+    yield f"event: done\ndata: {json.dumps(done)}\n\n"
 
 @app.post("/chat")
-def chat(query: Query):
-    response = bot.process_message(query.message)
-    return {"response": response}
+async def chat(query: Query):
+    session = sessions.get(query.session_id)
+    if query.stream:
+        return StreamingResponse(stream_events(query, session), media_type="text/event-stream")
+    response = await bot.process_message_async(query.message, session)
+    return {"response": response, "session_id": session.session_id, "language": session.language}
+
+class BatchQuery(BaseModel):
+    messages: List[str] = Field(max_length=MAX_BATCH_SIZE)
+    session_id: Optional[str] = None
+
+@app.post("/chat/batch")
+def chat_batch(query: BatchQuery):
+    session = sessions.get(query.session_id)
+    responses = bot.process_messages(query.messages, session)
+    return {"responses": responses, "session_id": session.session_id, "language": session.language}
+
+@app.get("/ready")
+def ready():
+    readiness = bot.get_readiness()
+    return JSONResponse(readiness, status_code=200 if readiness["ready"] else 503)
+
+@app.post("/knowledge/reload")
+def reload_knowledge():
+    try:
+        bot.reload_knowledge()
+    except (OSError, ValueError, KeyError) as e:
+        return JSONResponse({"reloaded": False, "error": str(e)}, status_code=500)
+    return {"reloaded": True}
+
+@app.get("/cache/stats")
+def cache_stats():
+    return {**bot.response_cache.stats(), "corpus_version": bot.corpus_version}
+
+@app.get("/stats")
+def stats():
+    # Served from running totals; logs still queued for the writer land within a flush interval
+    return {**bot.get_statistics(flush=False), "pending_logs": bot.interaction_logger.queue.qsize()}
+
+@app.get("/metrics")
+def metrics():
+    sessions_gauge = ("rhea_sessions_active", "Chat sessions held in memory", (), len(sessions))
+    return PlainTextResponse(bot.render_metrics([sessions_gauge]), media_type="text/plain; version=0.0.4")
@@ -0,0 +1,394 @@
+import argparse
+import contextlib
+import importlib.util
+import json
+import os
+import platform
+import random
+import statistics
+import subprocess
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Dict, List
+
+# Reproducible benchmarks for the RHEA pipeline and the FastAPI app. Everything runs
+# against the fallback corpus and a local HTTP stand-in for WHO/MOHFW, so no network
+# is needed. Results are written as JSON (milliseconds) for tracking p50/p99 over time:
+#
+#   python benchmark.py --output bench.json
+#   python benchmark.py --quick                 # small sizes, fewer iterations
+#   python benchmark.py --sizes 10,1000,100000 --skip-load
+
+BACKEND_DIR = os.path.dirname(os.path.abspath(__file__))
+BATCH_SIZE = int(os.environ.get('RHEA_MAX_BATCH_SIZE', '100'))
+
+# The refresh loop and the live scrape are replaced by the stand-in below
+os.environ.setdefault('RHEA_REFRESH_INTERVAL', '0')
+
+ENGLISH_MESSAGES = [
+    "I have fever and headache",
+    "tell me about dengue",
+    "my child has diarrhea and vomiting",
+    "covid vaccine booster",
+    "persistent cough for two weeks",
+    "how to control blood sugar",
+    "high blood pressure diet",
+    "feeling dizzy and tired",
+    "hedache and feaver since morning",
+    "mosquito bites and malaria",
+    "how do I quit tobacco",
+    "hello",
+    "chest pain and shortness of breath",
+    "food safety during monsoon",
+    "random words about nothing",
+]
+
+HINDI_MESSAGES = [
+    "मुझे बुखार है",
+    "सिरदर्द और खांसी",
+    "डेंगू के बारे में बताओ",
+    "मधुमेह का इलाज",
+    "टीबी के लक्षण",
+    "कोरोना वैक्सीन",
+    "उल्टी और दस्त",
+    "नमस्ते",
+    "उच्च रक्तचाप",
+    "मलेरिया से बचाव",
+]
+
+STAND_IN_PAGE = (
+    "<html><head><script>var analytics = 1;</script></head><body>"
+    + "".join(
+        f'<div class="content-article"><h2>Stand-in topic {i}</h2><p>'
+        + "Dengue and malaria spread through mosquito bites; remove standing water, use nets and repellents, and see a doctor for high fever. " * 2
+        + "</p></div>"
+        for i in range(5)
+    )
+    + "<ul>"
+    + "".join(
+        f"<li>Ministry health advisory {i}: vaccine drives, disease prevention and treatment guidance for the monsoon season across all states and union territories.</li>"
+        for i in range(12)
+    )
+    + "</ul></body></html>"
+).encode('utf-8')
+
+def load_chatbot_module():
+    # backend.py imports rhea_python_chatbot; the module lives in rhea-python-chatbot.py
+    try:
+        import rhea_python_chatbot
+        return rhea_python_chatbot
+    except ImportError:
+        spec = importlib.util.spec_from_file_location(
+            'rhea_python_chatbot', os.path.join(BACKEND_DIR, 'rhea-python-chatbot.py')
+        )
+        module = importlib.util.module_from_spec(spec)
+        sys.modules['rhea_python_chatbot'] = module
+        spec.loader.exec_module(module)
+        return module
+
+rhea = load_chatbot_module()
+
+class StandInHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        etag = '"stand-in-v1"'
+        if self.headers.get('If-None-Match') == etag:
+            self.send_response(304)
+            self.end_headers()
+            return
+
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/html')
+        self.send_header('Content-Length', str(len(STAND_IN_PAGE)))
+        self.send_header('ETag', etag)
+        self.end_headers()
+        self.wfile.write(STAND_IN_PAGE)
+
+    def log_message(self, format, *args):
+        pass
+
+def start_stand_in() -> ThreadingHTTPServer:
+    server = ThreadingHTTPServer(('127.0.0.1', 0), StandInHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+def point_at_stand_in(bot, server: ThreadingHTTPServer):
+    base = f"http://127.0.0.1:{server.server_address[1]}"
+    bot.fetcher.close()
+    bot.fetcher = rhea.FetchEngine(per_host_interval=0)
+    for name, source in bot.sources.items():
+        source.urls = [f"{base}/{name.lower()}/{i}" for i in range(len(source.urls))]
+
+def summarize(samples: List[float]) -> Dict:
+    samples = sorted(samples)
+
+    def percentile(p: float) -> float:
+        return samples[min(len(samples) - 1, int(round(p / 100 * (len(samples) - 1))))]
+
+    total = sum(samples)
+    return {
+        'n': len(samples),
+        'p50_ms': round(percentile(50) * 1000, 4),
+        'p90_ms': round(percentile(90) * 1000, 4),
+        'p99_ms': round(percentile(99) * 1000, 4),
+        'mean_ms': round(statistics.fmean(samples) * 1000, 4),
+        'max_ms': round(samples[-1] * 1000, 4),
+        'ops_per_sec': round(len(samples) / total, 1) if total else None,
+    }
+
+def measure(func: Callable, inputs: List, iterations: int, warmup: int = 5) -> Dict:
+    for i in range(min(warmup, iterations)):
+        func(inputs[i % len(inputs)])
+
+    samples = []
+    for i in range(iterations):
+        item = inputs[i % len(inputs)]
+        start = time.perf_counter()
+        func(item)
+        samples.append(time.perf_counter() - start)
+    return summarize(samples)
+
+def mixed_messages(count: int, hindi_share: float, seed: int) -> List[str]:
+    rng = random.Random(seed)
+    return [
+        rng.choice(HINDI_MESSAGES if rng.random() < hindi_share else ENGLISH_MESSAGES)
+        for _ in range(count)
+    ]
+
+def uncached(messages: List[str]) -> List[str]:
+    # A numeric suffix gives every message its own cache key without changing what it matches
+    return [f"{message} {i}" for i, message in enumerate(messages)]
+
+def cold_refresh(bot):
+    # Forget validators and page hashes so every page is downloaded and parsed again
+    with bot.db.transaction() as conn:
+        conn.execute("DELETE FROM source_cache")
+    bot.get_health_data()
+
+def new_bot():
+    bot = rhea.RHEAHealthBot()
+    bot.load_fallback_data()
+    return bot
+
+def bench_stages(iterations: int, server: ThreadingHTTPServer) -> Dict:
+    bot = new_bot()
+    messages = mixed_messages(200, 0.3, seed=1)
+    english_tokens = [rhea.tokenize(message) for message in ENGLISH_MESSAGES]
+    session = rhea.ChatSession('bench')
+    results = {}
+
+    results['tokenize'] = measure(rhea.tokenize, messages, iterations)
+    results['recognize_symptoms'] = measure(lambda message: bot.recognize_symptoms(message, 'english'), ENGLISH_MESSAGES, iterations)
+    results['analyze_tokens'] = measure(lambda message_tokens: bot.analyze_tokens(message_tokens, 'english'), english_tokens, iterations)
+    if bot.fuzzy_indexes:
+        fuzzy_index = bot.fuzzy_indexes['english']
+        results['fuzzy_lookup'] = measure(
+            lambda word: (fuzzy_index.cache.clear(), fuzzy_index.lookup(word)),
+            ['hedache', 'feaver', 'diarhea', 'tuberclosis', 'pnuemonia'],
+            iterations
+        )
+    results['route_message'] = measure(lambda message: bot.route_message(message, session), uncached(messages * 50), iterations)
+    results['get_disease_articles'] = measure(
+        bot.get_disease_articles, [['dengue'], ['covid', 'malaria'], ['diabetes'], ['tuberculosis', 'pneumonia']], iterations
+    )
+    results['search_health_info'] = measure(
+        bot.search_health_info, ['tobacco cessation', 'food safety monsoon', 'mental health helpline', 'xyz qwe'], iterations
+    )
+    results['log_interaction'] = measure(lambda message: bot.log_interaction(message, 'response', 'english'), messages, iterations)
+    bot.interaction_logger.flush()
+    results['process_message_uncached'] = measure(
+        lambda message: bot.process_message(message, rhea.ChatSession('bench')), uncached(messages * 50), iterations
+    )
+    results['process_message_cached'] = measure(
+        lambda message: bot.process_message(message, rhea.ChatSession('bench')), messages, iterations
+    )
+    results['parse_who_page'] = measure(bot.parse_who_page, [STAND_IN_PAGE], max(10, iterations // 20))
+    results['parse_mohfw_page'] = measure(bot.parse_mohfw_page, [STAND_IN_PAGE], max(10, iterations // 20))
+
+    point_at_stand_in(bot, server)
+    refreshes = max(5, iterations // 100)
+    results['refresh_cold'] = measure(lambda _: cold_refresh(bot), [None], refreshes, warmup=1)
+    results['refresh_revalidate'] = measure(lambda _: bot.get_health_data(), [None], refreshes, warmup=1)
+
+    bot.close()
+    return results
+
+def synthetic_articles(bot, count: int, seed: int) -> Dict[str, str]:
+    # Fallback articles reshuffled sentence by sentence, so tags and vocabulary stay realistic
+    rng = random.Random(seed)
+    corpus = {**bot.get_fallback_who_data(), **bot.get_fallback_mohfw_data()}
+    sentences = [sentence.strip() for content in corpus.values() for sentence in content.split('.') if sentence.strip()]
+    titles = list(corpus)
+
+    return {
+        f"{rng.choice(titles)} #{i}": '. '.join(rng.sample(sentences, 4)) + '.'
+        for i in range(count)
+    }
+
+def bench_scaling(sizes: List[int], iterations: int) -> Dict:
+    results = {}
+
+    for size in sizes:
+        print(f"scaling: {size} articles", file=sys.stderr)
+        bot = rhea.RHEAHealthBot()
+        articles = synthetic_articles(bot, size, seed=size)
+
+        start = time.perf_counter()
+        bot.sync_health_data({'BENCH': articles}, 'fallback', {'BENCH': 'fallback'})
+        ingest_seconds = time.perf_counter() - start
+
+        messages = uncached(mixed_messages(500, 0.3, seed=2))
+        session = rhea.ChatSession('bench')
+        results[str(size)] = {
+            'ingest_total_ms': round(ingest_seconds * 1000, 1),
+            'ingest_per_article_ms': round(ingest_seconds * 1000 / size, 4),
+            'get_disease_articles': measure(bot.get_disease_articles, [['dengue'], ['covid', 'malaria'], ['diabetes']], iterations),
+            'search_health_info': measure(
+                bot.search_health_info, ['tobacco cessation', 'food safety monsoon', 'mental health helpline'], iterations
+            ),
+            'process_message_uncached': measure(lambda message: bot.process_message(message, session), messages, iterations),
+        }
+        bot.close()
+
+    return results
+
+def bench_workloads(count: int) -> Dict:
+    results = {}
+
+    for name, hindi_share in (('english', 0.0), ('mixed_70_30', 0.3), ('hindi', 1.0)):
+        bot = new_bot()
+        messages = mixed_messages(count, hindi_share, seed=3)
+        sessions = {
+            'english': rhea.ChatSession('bench-en', 'english'),
+            'hindi': rhea.ChatSession('bench-hi', 'hindi'),
+        }
+
+        def run(message: str):
+            language = 'hindi' if message in HINDI_MESSAGES else 'english'
+            bot.process_message(message, sessions[language])
+
+        # Repeats are served from the response cache, as they would be in production
+        results[name] = measure(run, messages, count)
+
+        # Replayed in /chat/batch-sized chunks, as a client of the API would have to
+        replay = uncached(messages)
+        batch_session = rhea.ChatSession('bench-batch')
+        start = time.perf_counter()
+        for offset in range(0, len(replay), BATCH_SIZE):
+            bot.process_messages(replay[offset:offset + BATCH_SIZE], batch_session)
+        elapsed = time.perf_counter() - start
+        results[name]['batch_msgs_per_sec'] = round(count / elapsed, 1)
+        bot.close()
+
+    return results
+
+def bench_load(requests_total: int, concurrency: int, server: ThreadingHTTPServer) -> Dict:
+    import requests
+    import uvicorn
+    import backend
+
+    point_at_stand_in(backend.bot, server)
+    config = uvicorn.Config(backend.app, host='127.0.0.1', port=0, log_level='warning')
+    app_server = uvicorn.Server(config)
+    thread = threading.Thread(target=app_server.run, daemon=True)
+    thread.start()
+    while not app_server.started:
+        time.sleep(0.05)
+    port = app_server.servers[0].sockets[0].getsockname()[1]
+    url = f"http://127.0.0.1:{port}"
+
+    local = threading.local()
+
+    def post(path: str, body: Dict) -> float:
+        if not hasattr(local, 'session'):
+            local.session = requests.Session()
+        start = time.perf_counter()
+        response = local.session.post(f"{url}{path}", json=body, timeout=30)
+        response.raise_for_status()
+        return time.perf_counter() - start
+
+    def run(path: str, bodies: List[Dict]) -> Dict:
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=concurrency) as executor:
+            samples = list(executor.map(lambda body: post(path, body), bodies))
+        elapsed = time.perf_counter() - start
+        result = summarize(samples)
+        result['throughput_rps'] = round(len(bodies) / elapsed, 1)
+        return result
+
+    messages = mixed_messages(requests_total, 0.3, seed=4)
+    results = {
+        'concurrency': concurrency,
+        'chat_cached': run('/chat', [{'message': message} for message in messages]),
+        'chat_uncached': run('/chat', [{'message': message} for message in uncached(messages)]),
+        'chat_stream': run('/chat', [{'message': message, 'stream': True} for message in uncached(messages)]),
+        'chat_batch_20': run(
+            '/chat/batch',
+            [{'messages': uncached(messages[i:i + 20])} for i in range(0, len(messages), 20)]
+        ),
+    }
+
+    app_server.should_exit = True
+    thread.join(timeout=10)
+    return results
+
+def git_commit() -> str:
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'], cwd=BACKEND_DIR, capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the RHEA pipeline and API")
+    parser.add_argument('--output', help="write JSON results here instead of stdout")
+    parser.add_argument('--quick', action='store_true', help="small corpus sizes and fewer iterations")
+    parser.add_argument('--iterations', type=int, default=None)
+    parser.add_argument('--sizes', default=None, help="comma-separated corpus sizes (default 10,1000,100000)")
+    parser.add_argument('--requests', type=int, default=None, help="requests per load-test scenario")
+    parser.add_argument('--concurrency', type=int, default=16)
+    parser.add_argument('--skip-load', action='store_true')
+    args = parser.parse_args()
+
+    iterations = args.iterations or (200 if args.quick else 2000)
+    sizes = [int(size) for size in (args.sizes or ('10,1000' if args.quick else '10,1000,100000')).split(',')]
+    requests_total = args.requests or (200 if args.quick else 2000)
+
+    random.seed(0)
+    server = start_stand_in()
+    results = {
+        'meta': {
+            'timestamp': datetime.now().isoformat(),
+            'commit': git_commit(),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'iterations': iterations,
+        }
+    }
+
+    # The bot prints progress; keep stdout for the JSON report
+    with contextlib.redirect_stdout(sys.stderr):
+        print("stages", file=sys.stderr)
+        results['stages'] = bench_stages(iterations, server)
+        results['scaling'] = bench_scaling(sizes, max(50, iterations // 10))
+        print("workloads", file=sys.stderr)
+        results['workloads'] = bench_workloads(iterations)
+        if not args.skip_load:
+            print("load", file=sys.stderr)
+            results['load'] = bench_load(requests_total, args.concurrency, server)
+
+    server.shutdown()
+
+    report = json.dumps(results, indent=2, ensure_ascii=False)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            f.write(report + '\n')
+    else:
+        print(report)
+
+if __name__ == '__main__':
+    main()
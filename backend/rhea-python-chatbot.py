@@ -1,21 +1,1329 @@
 import requests
-from bs4 import BeautifulSoup
+from requests.adapters import HTTPAdapter
+from bs4 import BeautifulSoup, SoupStrainer
 import json
+import math
+import multiprocessing
 import re
-import difflib
+import os
+import hashlib
+import shutil
+import sys
+import tempfile
+import unicodedata
 from datetime import datetime
 import sqlite3
-from typing import Dict, List, Tuple
+from types import MappingProxyType
+from typing import AsyncIterator, Dict, Iterator, List, Mapping, Optional, Tuple
 import logging
 import time
+import threading
+import uuid
+import queue
+import asyncio
+from functools import partial, wraps
+import bisect
+from collections import OrderedDict, deque
+from contextlib import contextmanager
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, wait
+from urllib.parse import quote, urlparse
+import xml.etree.ElementTree as ElementTree
+import zlib
 
-class RHEAHealthBot:
+class StageTimer:
+    __slots__ = ('metrics', 'name', 'labels', 'start')
+
+    def __init__(self, metrics: 'Metrics', name: str, labels: Tuple):
+        self.metrics = metrics
+        self.name = name
+        self.labels = labels
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.metrics.observe(self.name, time.perf_counter() - self.start, self.labels)
+        return False
+
+class Metrics:
+    # In-process histograms and counters rendered in the Prometheus text format.
+    # Recording is a perf_counter pair, a bisect and a locked increment.
+    BUCKETS = (0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05,
+               0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+    
+    HELP = {
+        'rhea_stage_seconds': 'Time spent in each message pipeline stage',
+        'rhea_message_seconds': 'End-to-end time to answer one message',
+        'rhea_fetch_seconds': 'Time to fetch one source URL',
+        'rhea_parse_seconds': 'Time to parse one fetched page',
+        'rhea_refresh_seconds': 'Time for one corpus refresh',
+        'rhea_log_write_seconds': 'Time to commit one batch of interaction logs',
+        'rhea_fetch_total': 'Source URL fetches by outcome',
+        'rhea_corpus_changes_total': 'Articles inserted, updated or expired by refreshes'
+    }
+
+    def __init__(self, enabled: bool = True):
+        self.enabled = enabled
+        self.histograms = {}
+        self.counters = {}
+        self.lock = threading.Lock()
+
+    def timed(self, name: str, **labels) -> StageTimer:
+        return StageTimer(self, name, tuple(sorted(labels.items())))
+
+    def observe(self, name: str, value: float, labels: Tuple = ()):
+        if not self.enabled:
+            return
+        
+        index = bisect.bisect_left(self.BUCKETS, value)
+        with self.lock:
+            series = self.histograms.setdefault(name, {})
+            histogram = series.get(labels)
+            if histogram is None:
+                histogram = series[labels] = [[0] * len(self.BUCKETS), 0.0, 0]
+            if index < len(self.BUCKETS):
+                histogram[0][index] += 1
+            histogram[1] += value
+            histogram[2] += 1
+
+    def increment(self, name: str, amount: float = 1, **labels):
+        if not self.enabled:
+            return
+        
+        key = tuple(sorted(labels.items()))
+        with self.lock:
+            series = self.counters.setdefault(name, {})
+            series[key] = series.get(key, 0) + amount
+
+    def format_labels(self, labels: Tuple) -> str:
+        if not labels:
+            return ''
+        escaped = ('{}="{}"'.format(key, str(value).replace('\\', '\\\\').replace('"', '\\"')) for key, value in labels)
+        return '{' + ','.join(escaped) + '}'
+
+    def render(self, gauges: List[Tuple[str, str, Tuple, float]] = None, counters: List[Tuple[str, str, Tuple, float]] = None) -> str:
+        # gauges and counters are (name, help, labels, value) rows sampled by the caller at scrape time
+        lines = []
+        
+        with self.lock:
+            histograms = {name: {labels: (list(h[0]), h[1], h[2]) for labels, h in series.items()} for name, series in self.histograms.items()}
+            own_counters = {name: dict(series) for name, series in self.counters.items()}
+        
+        for name, series in sorted(histograms.items()):
+            lines.append(f"# HELP {name} {self.HELP.get(name, name)}")
+            lines.append(f"# TYPE {name} histogram")
+            for labels, (buckets, total, count) in sorted(series.items()):
+                cumulative = 0
+                for bound, bucket_count in zip(self.BUCKETS, buckets):
+                    cumulative += bucket_count
+                    lines.append(f"{name}_bucket{self.format_labels(labels + (('le', repr(bound)),))} {cumulative}")
+                lines.append(f"{name}_bucket{self.format_labels(labels + (('le', '+Inf'),))} {count}")
+                lines.append(f"{name}_sum{self.format_labels(labels)} {total}")
+                lines.append(f"{name}_count{self.format_labels(labels)} {count}")
+        
+        sampled = {}
+        for metric_type, rows in (('counter', counters or []), ('gauge', gauges or [])):
+            for name, help_text, labels, value in rows:
+                sampled.setdefault((name, metric_type, help_text), []).append((tuple(labels), value))
+        for name, series in sorted(own_counters.items()):
+            sampled[(name, 'counter', self.HELP.get(name, name))] = sorted(series.items())
+        
+        for (name, metric_type, help_text), series in sampled.items():
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} {metric_type}")
+            for labels, value in series:
+                lines.append(f"{name}{self.format_labels(labels)} {value}")
+        
+        return '\n'.join(lines) + '\n'
+
+def timed_stage(stage: str):
+    # Records the wrapped method's duration under rhea_stage_seconds{stage=...}
+    def decorator(func):
+        labels = (('stage', stage),)
+        
+        @wraps(func)
+        def wrapper(self, *args, **kwargs):
+            with StageTimer(self.metrics, 'rhea_stage_seconds', labels):
+                return func(self, *args, **kwargs)
+        return wrapper
+    return decorator
+
+class HostRateLimiter:
+    def __init__(self, min_interval: float = 1.0):
+        self.min_interval = min_interval
+        self.next_slot = {}
+        self.lock = threading.Lock()
+
+    def wait(self, url: str):
+        host = urlparse(url).netloc
+        with self.lock:
+            now = time.monotonic()
+            slot = max(now, self.next_slot.get(host, now))
+            self.next_slot[host] = slot + self.min_interval
+        
+        delay = slot - time.monotonic()
+        if delay > 0:
+            time.sleep(delay)
+
+class FetchEngine:
+    def __init__(self, max_workers: int = 8, timeout: float = 15, per_host_interval: float = 1.0, metrics: Metrics = None):
+        self.timeout = timeout
+        self.metrics = metrics or Metrics(enabled=False)
+        self.rate_limiter = HostRateLimiter(per_host_interval)
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='rhea-fetch')
+        
+        # One keep-alive session shared by every fetch thread
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=max_workers, pool_maxsize=max_workers)
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+
+    def fetch(self, url: str, headers: Dict, timeout: float = None, gate: threading.Semaphore = None) -> requests.Response:
+        if gate is None:
+            return self.get(url, headers, timeout)
+        
+        with gate:
+            return self.get(url, headers, timeout)
+
+    def get(self, url: str, headers: Dict, timeout: float = None) -> requests.Response:
+        self.rate_limiter.wait(url)
+        host = urlparse(url).netloc
+        
+        try:
+            with self.metrics.timed('rhea_fetch_seconds', host=host):
+                response = self.session.get(url, headers=headers, timeout=timeout or self.timeout)
+        except Exception:
+            self.metrics.increment('rhea_fetch_total', host=host, status='error')
+            raise
+        
+        self.metrics.increment('rhea_fetch_total', host=host, status=str(response.status_code))
+        return response
+
+    def fetch_all(self, targets: List[Tuple], budget: float = None) -> Dict:
+        # A target is (url, headers) or (url, headers, timeout, gate), where the gate caps how
+        # many of one source's URLs are in flight at once
+        futures = {self.executor.submit(self.fetch, *target): target[0] for target in targets}
+        
+        # Allow for the per-host spacing of the busiest host on top of the slowest source's budget
+        hosts = [urlparse(target[0]).netloc for target in targets]
+        busiest_host = max((hosts.count(host) for host in hosts), default=0)
+        deadline = (budget or self.timeout) + self.rate_limiter.min_interval * busiest_host
+        
+        done, not_done = wait(futures, timeout=deadline)
+        
+        responses = {}
+        for future in done:
+            try:
+                responses[futures[future]] = future.result()
+            except Exception as e:
+                logging.warning(f"Error fetching {futures[future]}: {e}")
+        
+        for future in not_done:
+            future.cancel()
+            logging.warning(f"Timed out fetching {futures[future]}")
+        
+        return responses
+
+    def close(self):
+        self.executor.shutdown(wait=False, cancel_futures=True)
+        self.session.close()
+
+try:
+    import lxml
+    DEFAULT_HTML_PARSER = 'lxml'
+except ImportError:
+    DEFAULT_HTML_PARSER = 'html.parser'
+
+HTML_PARSER = os.environ.get('RHEA_HTML_PARSER', DEFAULT_HTML_PARSER)
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+try:
+    from wordfreq import zipf_frequency
+except ImportError:
+    zipf_frequency = None
+
+class ExtractionRule:
+    # How articles are laid out on one source's pages. Only the container elements are
+    # built into a tree; the rest of the page is skipped while it is being parsed.
+    def __init__(self, containers: List[str], class_pattern: str = None, text_pattern: str = None,
+                 title_tags: List[str] = None, body_tags: List[str] = None, limit: int = 5,
+                 min_length: int = 100, max_length: float = math.inf, truncate: int = None, title_prefix: str = 'Article'):
+        self.containers = containers
+        self.class_pattern = re.compile(class_pattern, re.I) if class_pattern else None
+        self.text_pattern = re.compile(text_pattern, re.I) if text_pattern else None
+        self.title_tags = title_tags
+        self.body_tags = body_tags
+        self.limit = limit
+        self.min_length = min_length
+        self.max_length = max_length
+        self.truncate = truncate
+        self.title_prefix = title_prefix
+        
+        if self.class_pattern:
+            self.strainer = SoupStrainer(containers, class_=self.class_pattern)
+        else:
+            self.strainer = SoupStrainer(containers)
+
+    def extract(self, content: bytes, parser: str = None) -> Dict:
+        soup = BeautifulSoup(content, parser or HTML_PARSER, parse_only=self.strainer)
+        if self.title_tags:
+            return self.extract_sections(soup)
+        return self.extract_passages(soup)
+
+    def extract_sections(self, soup: BeautifulSoup) -> Dict:
+        # A heading plus the first body element under it makes one article
+        page_data = {}
+        
+        for section in soup.find_all(self.containers, class_=self.class_pattern, limit=self.limit):
+            title_elem = section.find(self.title_tags)
+            if title_elem:
+                title = title_elem.get_text(strip=True)
+                content_elem = section.find(self.body_tags)
+                if content_elem:
+                    text = content_elem.get_text(strip=True)[:self.truncate]
+                    if len(text) > self.min_length and title not in page_data:
+                        page_data[title] = text
+        
+        return page_data
+
+    def extract_passages(self, soup: BeautifulSoup) -> Dict:
+        # Untitled passages whose text matches the rule are numbered in page order
+        page_data = {}
+        
+        for item in soup.find_all(self.containers, string=self.text_pattern, limit=self.limit):
+            text = item.get_text(strip=True)
+            if self.min_length < len(text) < self.max_length:
+                page_data[f"{self.title_prefix} {len(page_data) + 1}"] = text
+        
+        return page_data
+
+def parse_page(rule: ExtractionRule, content: bytes, parser: str = None) -> Dict:
+    # Module level so it can be shipped to a parse worker process
+    return rule.extract(content, parser)
+
+class HealthSource:
+    # One health feed: where to fetch it, how to read it, and how often and how hard to poll it.
+    # mode 'first' treats the URLs as mirrors and keeps the first that yields articles.
+    def __init__(self, name: str, urls: List[str], headers: Dict = None, feed_format: str = 'html',
+                 rule: ExtractionRule = None, mode: str = 'all', category: str = 'general',
+                 refresh_interval: float = 3600, timeout: float = 15, priority: int = 0,
+                 max_concurrency: int = 2, limit: int = 20, fallback=None):
+        if feed_format == 'html' and rule is None:
+            raise ValueError(f"HTML source {name} needs an extraction rule")
+        
+        self.name = name
+        self.urls = urls
+        self.headers = headers or {}
+        self.feed_format = feed_format
+        self.rule = rule
+        self.mode = mode
+        self.category = category
+        self.refresh_interval = refresh_interval
+        self.timeout = timeout
+        self.priority = priority
+        self.max_concurrency = max_concurrency
+        self.limit = limit
+        self.fallback = fallback
+        self.gate = threading.BoundedSemaphore(max_concurrency)
+
+    @classmethod
+    def from_dict(cls, spec: Dict) -> 'HealthSource':
+        spec = dict(spec)
+        if 'rule' in spec:
+            # Untitled passages are numbered under the source's name unless the rule says otherwise
+            spec['rule'] = ExtractionRule(**{'title_prefix': spec['name'], **spec['rule']})
+        if 'fallback' in spec:
+            spec['fallback'] = partial(dict, spec['fallback'])
+        return cls(**spec)
+
+    def fetch_budget(self) -> float:
+        # Worst case for one refresh: every URL waits its turn at the concurrency gate
+        return self.timeout * math.ceil(len(self.urls) / self.max_concurrency)
+
+    def get_fallback(self) -> Dict:
+        return self.fallback() if self.fallback else {}
+
+    def parse_feed(self, content: bytes) -> Dict:
+        if self.feed_format == 'json':
+            return self.parse_json(content)
+        if self.feed_format == 'rss':
+            return self.parse_rss(content)
+        raise ValueError(f"Unknown feed format {self.feed_format!r} for source {self.name}")
+
+    def parse_json(self, content: bytes) -> Dict:
+        # Either {title: content} or a list of {"title": ..., "content"/"summary": ...}
+        data = json.loads(content)
+        if isinstance(data, dict):
+            items = data.items()
+        else:
+            items = [(item.get('title'), item.get('content') or item.get('summary')) for item in data]
+        
+        page_data = {}
+        for title, text in items:
+            if title and text and title not in page_data:
+                page_data[title] = text
+            if len(page_data) >= self.limit:
+                break
+        
+        return page_data
+
+    def parse_rss(self, content: bytes) -> Dict:
+        # RSS <item> and Atom <entry> elements; descriptions may carry escaped HTML
+        root = ElementTree.fromstring(content)
+        atom = '{http://www.w3.org/2005/Atom}'
+        page_data = {}
+        
+        for item in list(root.iter('item')) + list(root.iter(f'{atom}entry')):
+            title = item.findtext('title') or item.findtext(f'{atom}title')
+            text = (item.findtext('description') or item.findtext(f'{atom}summary')
+                    or item.findtext(f'{atom}content'))
+            if title and text and title not in page_data:
+                page_data[title.strip()] = BeautifulSoup(text, 'html.parser').get_text(' ', strip=True)
+            if len(page_data) >= self.limit:
+                break
+        
+        return page_data
+
+TOKEN_PATTERN = re.compile(r'[\w\u0900-\u0963\u0966-\u097F]+')
+
+# Drop nukta, zero-width joiners and apostrophes, and fold chandrabindu into anusvara
+TEXT_FOLDS = str.maketrans({'\u093c': None, '\u200c': None, '\u200d': None, "'": None, '\u2019': None, '\u0901': '\u0902'})
+
+def normalize_text(text: str) -> str:
+    return unicodedata.normalize('NFC', unicodedata.normalize('NFD', text).translate(TEXT_FOLDS)).lower()
+
+def fold_token(token: str) -> str:
+    # Fold simple English plurals so 'headaches' still finds 'headache'
+    if token.isascii() and len(token) > 4 and token.endswith('s') and not token.endswith(('ss', 'us', 'is')):
+        return token[:-1]
+    return token
+
+def tokenize(text: str) -> List[str]:
+    return [fold_token(token) for token in TOKEN_PATTERN.findall(normalize_text(text))]
+
+KNOWLEDGE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'rhea_knowledge.json')
+
+def load_knowledge_pack(path: str) -> Mapping:
+    with open(path, encoding='utf-8') as f:
+        raw_pack = json.load(f)
+    
+    return MappingProxyType({
+        language: MappingProxyType({
+            'symptom_advice': MappingProxyType(dict(pack['symptom_advice'])),
+            'general_advice': pack['general_advice'],
+            'emergency_keywords': tuple(pack['emergency_keywords']),
+            'emergency_response': pack['emergency_response'],
+            'help_info': pack['help_info']
+        })
+        for language, pack in raw_pack.items()
+    })
+
+class KeywordMatcher:
+    # Aho-Corasick automaton over word tokens: every keyword phrase of every kind is
+    # found in one pass over the message, and only on whole-word boundaries
     def __init__(self):
+        self.goto = [{}]
+        self.fail = [0]
+        self.output = [[]]
+        self.label_order = {}
+        self.vocabulary = set()
+
+    def add(self, keyword: str, kind: str, label: str):
+        self.label_order.setdefault((kind, label), len(self.label_order))
+        
+        state = 0
+        for token in tokenize(keyword):
+            self.vocabulary.add(token)
+            if token not in self.goto[state]:
+                self.goto.append({})
+                self.fail.append(0)
+                self.output.append([])
+                self.goto[state][token] = len(self.goto) - 1
+            state = self.goto[state][token]
+        
+        if state and (kind, label) not in self.output[state]:
+            self.output[state].append((kind, label))
+
+    def compile(self):
+        queue = deque(self.goto[0].values())
+        
+        while queue:
+            state = queue.popleft()
+            for token, next_state in self.goto[state].items():
+                queue.append(next_state)
+                
+                fallback = self.fail[state]
+                while fallback and token not in self.goto[fallback]:
+                    fallback = self.fail[fallback]
+                self.fail[next_state] = self.goto[fallback].get(token, 0)
+                self.output[next_state] = self.output[next_state] + self.output[self.fail[next_state]]
+        
+        return self
+
+    def scan(self, tokens: List[str]) -> Dict[str, List[str]]:
+        hits = set()
+        state = 0
+        
+        for token in tokens:
+            while state and token not in self.goto[state]:
+                state = self.fail[state]
+            state = self.goto[state].get(token, 0)
+            if self.output[state]:
+                hits.update(self.output[state])
+        
+        # Report labels in declaration order, matching the old per-table loops
+        matches = {}
+        for kind, label in sorted(hits, key=self.label_order.get):
+            matches.setdefault(kind, []).append(label)
+        return matches
+
+def trigrams(word: str) -> set:
+    padded = f"^^{word}$$"
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+def bounded_edit_distance(a: str, b: str, limit: int) -> int:
+    # Levenshtein distance, giving up with limit + 1 as soon as every cell in a row exceeds limit
+    if abs(len(a) - len(b)) > limit:
+        return limit + 1
+    
+    previous = list(range(len(b) + 1))
+    for i, char_a in enumerate(a, 1):
+        current = [i]
+        for j, char_b in enumerate(b, 1):
+            current.append(min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + (char_a != char_b)))
+        if min(current) > limit:
+            return limit + 1
+        previous = current
+    
+    return previous[-1]
+
+class FuzzyIndex:
+    # Trigram postings over keyword tokens. Every edit breaks at most three of a word's
+    # trigrams, so a word within k edits of a token shares at least
+    # len(trigrams) - 3k of them; only those candidates get a real edit distance.
+    # known_word says whether a token is a real word in the language; those are never corrected,
+    # so "spelling" stays "spelling" although it is one letter from "swelling"
+    def __init__(self, vocabulary: set, max_distance: int = 2, min_length: int = 5, cache_size: int = 10000,
+                 ignore: set = frozenset(), known_word=None):
+        self.vocabulary = frozenset(vocabulary)
+        self.ignore = frozenset(ignore)
+        self.known_word = known_word
+        self.max_distance = max_distance
+        self.min_length = min_length
+        self.cache_size = cache_size
+        self.cache = {}
+        self.postings = {}
+        
+        for word in self.vocabulary:
+            for gram in trigrams(word):
+                self.postings.setdefault(gram, []).append(word)
+
+    def allowed_distance(self, token: str) -> int:
+        # One typo up to eight characters, two beyond, so short words are not bent into keywords
+        return min(self.max_distance, 1 if len(token) <= 8 else 2)
+
+    def lookup(self, token: str) -> Optional[str]:
+        if token in self.cache:
+            return self.cache[token]
+        
+        if self.known_word is not None and self.known_word(token):
+            return self.remember(token, None)
+        
+        limit = self.allowed_distance(token)
+        grams = trigrams(token)
+        shared = {}
+        for gram in grams:
+            for word in self.postings.get(gram, ()):
+                shared[word] = shared.get(word, 0) + 1
+        
+        needed = len(grams) - 3 * limit
+        best = None
+        for word, count in shared.items():
+            if count < needed or abs(len(word) - len(token)) > limit:
+                continue
+            distance = bounded_edit_distance(token, word, limit)
+            if distance <= limit:
+                candidate = (distance, -count, word)
+                best = candidate if best is None else min(best, candidate)
+        
+        return self.remember(token, best[2] if best else None)
+
+    def remember(self, token: str, correction: Optional[str]) -> Optional[str]:
+        if len(self.cache) >= self.cache_size:
+            self.cache.clear()
+        self.cache[token] = correction
+        return correction
+
+    def correct(self, tokens: List[str], budget: float) -> List[str]:
+        # Tokens are corrected left to right until the time budget runs out
+        deadline = time.perf_counter() + budget
+        corrected = []
+        
+        for token in tokens:
+            if (token in self.vocabulary or token in self.ignore or len(token) < self.min_length
+                    or token.isdigit() or time.perf_counter() > deadline):
+                corrected.append(token)
+            else:
+                corrected.append(self.lookup(token) or token)
+        
+        return corrected
+
+class VectorIndex:
+    # Hashed TF-IDF vectors over word and character 4-gram features, one L2-normalised
+    # float32 row per article, so one matrix-vector product scores the whole corpus.
+    # Features are hashed with crc32, which unlike hash() is stable across processes.
+    # A query only counts words the corpus contains: an unknown word's 4-grams collide
+    # with real ones at random, which gave gibberish like "blorp" the same scores as
+    # genuine matches, so a query with no known word gets no vector hits at all.
+    #
+    # Budget at 100k articles and the default 1024 dimensions: the matrix is
+    # 100k x 1024 x 4 B = ~410 MB, memory-mapped so only touched pages are resident,
+    # plus ~30 MB for a vocabulary of ~500k distinct words.
+    # A query is ~102M multiply-adds, 20-50 ms on one core, plus ~1 ms to select the
+    # top k. A rebuild tokenizes every article in Python, ~15-30 s at that size, and
+    # runs on the refresh thread rather than in a request.
+    def __init__(self, path: str = None, dim: int = 1024):
+        self.path = path
+        self.dim = dim
+        # (matrix, ids, idf, vocabulary, version), replaced whole so a search never pairs one build's
+        # rows with another build's ids
+        self.state = None
+        
+        if path and os.path.exists(path) and os.path.exists(self.meta_path()):
+            self.load()
+
+    @property
+    def version(self) -> Optional[int]:
+        return self.state[4] if self.state else None
+
+    def meta_path(self) -> str:
+        return f"{self.path[:-len('.npy')]}-meta.npz"
+
+    def features(self, text: str, vocabulary: frozenset = None) -> List[int]:
+        buckets = []
+        for token in tokenize(text):
+            word = zlib.crc32(token.encode('utf-8'))
+            if vocabulary is not None and word not in vocabulary:
+                continue
+            buckets.append(word % self.dim)
+            padded = f"<{token}>"
+            for i in range(len(padded) - 3):
+                buckets.append(zlib.crc32(padded[i:i + 4].encode('utf-8')) % self.dim)
+        return buckets
+
+    def term_weights(self, text: str, vocabulary: frozenset = None) -> 'np.ndarray':
+        return np.log1p(np.bincount(self.features(text, vocabulary), minlength=self.dim).astype(np.float32))
+
+    def build(self, documents: List[Tuple[int, str]], version: int):
+        weights = np.zeros((len(documents), self.dim), dtype=np.float32)
+        for row, (_, text) in enumerate(documents):
+            weights[row] = self.term_weights(text)
+        
+        document_frequency = np.count_nonzero(weights, axis=0)
+        idf = (np.log((1 + len(documents)) / (1 + document_frequency)) + 1).astype(np.float32)
+        matrix = weights * idf
+        norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+        matrix /= np.where(norms == 0, 1, norms)
+        ids = np.array([article_id for article_id, _ in documents], dtype=np.int64)
+        vocabulary = frozenset(zlib.crc32(token.encode('utf-8')) for _, text in documents for token in tokenize(text))
+        
+        if self.path:
+            self.save(matrix, ids, idf, vocabulary, version)
+            self.load()
+        else:
+            self.state = (matrix, ids, idf, vocabulary, version)
+
+    def save(self, matrix: 'np.ndarray', ids: 'np.ndarray', idf: 'np.ndarray', vocabulary: frozenset, version: int):
+        # Written beside the live files and renamed over them, so a reader never maps a partial matrix
+        with open(f"{self.path}.tmp", 'wb') as f:
+            np.save(f, matrix)
+        with open(f"{self.meta_path()}.tmp", 'wb') as f:
+            np.savez(f, ids=ids, idf=idf, vocabulary=np.array(sorted(vocabulary), dtype=np.uint32), version=np.int64(version))
+        os.replace(f"{self.path}.tmp", self.path)
+        os.replace(f"{self.meta_path()}.tmp", self.meta_path())
+
+    def load(self):
+        with np.load(self.meta_path()) as meta:
+            # Files from before the vocabulary was stored are left unloaded and rebuilt
+            if 'vocabulary' not in meta:
+                return
+            ids, idf, version = meta['ids'], meta['idf'], int(meta['version'])
+            vocabulary = frozenset(meta['vocabulary'].tolist())
+        matrix = np.load(self.path, mmap_mode='r')
+        if matrix.shape != (len(ids), self.dim):
+            return
+        self.state = (matrix, ids, idf, vocabulary, version)
+
+    def search(self, text: str, k: int = 10, min_score: float = 0.0) -> List[Tuple[int, float]]:
+        state = self.state
+        if state is None or not len(state[1]):
+            return []
+        matrix, ids, idf, vocabulary, _ = state
+        
+        query = self.term_weights(text, vocabulary) * idf
+        norm = np.linalg.norm(query)
+        if norm == 0:
+            return []
+        
+        scores = matrix @ (query / norm)
+        k = min(k, len(scores))
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top])]
+        return [(int(ids[i]), float(scores[i])) for i in top if scores[i] > min_score]
+
+class HealthDatabase:
+    # One writer connection behind a lock plus a read connection per thread. A file-backed
+    # database runs in WAL mode so readers proceed while the writer commits. ':memory:'
+    # cannot be shared between connections, so there every reader borrows the writer.
+    # Without a path a scratch file is used and removed on close, so the default setup
+    # still gets concurrent readers.
+    def __init__(self, path: str = None):
+        self.temporary = path is None
+        if self.temporary:
+            fd, path = tempfile.mkstemp(prefix='rhea-', suffix='.db')
+            os.close(fd)
+        self.path = path
+        self.in_memory = path == ':memory:'
+        self.write_lock = threading.RLock()
+        self.local = threading.local()
+        self.readers = []
+        self.readers_lock = threading.Lock()
+        
+        self.writer = self.connect()
+        if not self.in_memory:
+            self.writer.execute("PRAGMA journal_mode=WAL")
+            self.writer.execute("PRAGMA synchronous=NORMAL")
+
+    def connect(self) -> sqlite3.Connection:
+        return sqlite3.connect(self.path, check_same_thread=False, timeout=30)
+
+    @contextmanager
+    def reader(self):
+        if self.in_memory:
+            with self.write_lock:
+                yield self.writer
+        else:
+            conn = getattr(self.local, 'conn', None)
+            if conn is None:
+                conn = self.connect()
+                conn.execute("PRAGMA query_only=ON")
+                self.local.conn = conn
+                with self.readers_lock:
+                    self.readers.append(conn)
+            yield conn
+
+    @contextmanager
+    def transaction(self):
+        with self.write_lock:
+            with self.writer:
+                yield self.writer
+
+    def close(self):
+        with self.readers_lock:
+            for conn in self.readers:
+                conn.close()
+            self.readers = []
+        with self.write_lock:
+            self.writer.close()
+        
+        if self.temporary:
+            for suffix in ('', '-wal', '-shm'):
+                try:
+                    os.remove(self.path + suffix)
+                except OSError:
+                    pass
+
+class CorpusSnapshot:
+    # Read-only corpus files shared by every worker. A refresher publishes each corpus with
+    # VACUUM INTO as a new snapshot-<ms>.db and then atomically replaces the CURRENT pointer,
+    # so a published file never changes. Readers therefore open it with immutable=1 (no locks,
+    # no WAL, no change checks) and mmap it, so every worker reads the same page-cache pages.
+    # A reader that sees a new pointer moves each thread's connection over on its next query.
+    POINTER = 'CURRENT'
+    PREFIX = 'snapshot-'
+
+    def __init__(self, directory: str, keep: int = 3, mmap_size: int = 256 * 1024 * 1024):
+        self.directory = directory
+        self.keep = keep
+        self.mmap_size = mmap_size
+        self.path = None
+        self.local = threading.local()
+        self.readers = []
+        self.readers_lock = threading.Lock()
+        self.published = self.read_pointer()
+        os.makedirs(directory, exist_ok=True)
+
+    @property
+    def pointer_path(self) -> str:
+        return os.path.join(self.directory, self.POINTER)
+
+    @property
+    def vector_path(self) -> str:
+        return f"{self.path}.vectors.npy"
+
+    def read_pointer(self) -> Dict:
+        try:
+            with open(self.pointer_path, encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def connect(self, path: str) -> sqlite3.Connection:
+        conn = sqlite3.connect(f"file:{quote(os.path.abspath(path))}?mode=ro&immutable=1", uri=True, check_same_thread=False)
+        conn.execute(f"PRAGMA mmap_size={int(self.mmap_size)}")
+        return conn
+
+    def publish(self, db: HealthDatabase, pointer: Dict, vector_path: str = None) -> str:
+        name = f"{self.PREFIX}{int(time.time() * 1000)}.db"
+        path = os.path.join(self.directory, name)
+        
+        # VACUUM INTO writes a compacted copy without blocking readers of the working database
+        with db.write_lock:
+            db.writer.execute("VACUUM INTO ?", (f"{path}.tmp",))
+        conn = sqlite3.connect(f"{path}.tmp")
+        conn.execute("PRAGMA journal_mode=DELETE")
+        conn.close()
+        
+        if vector_path and os.path.exists(vector_path):
+            shutil.copyfile(vector_path, f"{path}.vectors.npy")
+            shutil.copyfile(f"{vector_path[:-len('.npy')]}-meta.npz", f"{path}.vectors-meta.npz")
+        os.replace(f"{path}.tmp", path)
+        
+        pointer = dict(pointer, snapshot=name)
+        with open(f"{self.pointer_path}.tmp", 'w', encoding='utf-8') as f:
+            json.dump(pointer, f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(f"{self.pointer_path}.tmp", self.pointer_path)
+        self.published = pointer
+        self.prune(name)
+        return name
+
+    def prune(self, current: str):
+        # Older generations stay for a while for readers that have not switched yet; on POSIX
+        # a file removed under an open connection stays readable until that connection closes
+        names = sorted(
+            name for name in os.listdir(self.directory)
+            if name.startswith(self.PREFIX) and name.endswith('.db') and name != current
+        )
+        for name in names[:max(0, len(names) - self.keep + 1)]:
+            for suffix in ('', '.vectors.npy', '.vectors-meta.npz'):
+                try:
+                    os.remove(os.path.join(self.directory, name + suffix))
+                except OSError:
+                    pass
+
+    def refresh(self) -> bool:
+        # Returns True when a different snapshot has been published and it opened cleanly
+        name = self.read_pointer().get('snapshot')
+        if not name:
+            return False
+        
+        path = os.path.join(self.directory, name)
+        if path == self.path:
+            return False
+        
+        try:
+            conn = self.connect(path)
+            conn.execute("SELECT COUNT(*) FROM corpus_meta").fetchone()
+            conn.close()
+        except sqlite3.Error as e:
+            logging.warning(f"Skipping unreadable corpus snapshot {name}: {e}")
+            return False
+        
+        self.path = path
+        return True
+
+    @contextmanager
+    def reader(self):
+        path = self.path
+        conn = getattr(self.local, 'conn', None)
+        if conn is None or self.local.path != path:
+            if conn is not None:
+                with self.readers_lock:
+                    self.readers.remove(conn)
+                conn.close()
+            conn = self.connect(path)
+            self.local.conn, self.local.path = conn, path
+            with self.readers_lock:
+                self.readers.append(conn)
+        yield conn
+
+    def close(self):
+        with self.readers_lock:
+            for conn in self.readers:
+                conn.close()
+            self.readers = []
+
+class SessionArchive:
+    # Interaction logs in one table per UTC day (user_sessions_YYYYMMDD). Each row keeps the
+    # user's input and a reference into response_store, where every distinct response body
+    # is held once, so a row is ~60 bytes instead of the 1-2 KB of advice text it answered
+    # with. Days older than retention_days are dropped whole, along with responses nothing
+    # references any more. The user_sessions view reassembles the old row shape.
+    PARTITION_PREFIX = 'user_sessions_'
+
+    def __init__(self, db: HealthDatabase, retention_days: int = 30, cache_size: int = 4096):
+        self.db = db
+        self.retention_days = retention_days
+        self.cache_size = cache_size
+        self.response_ids = {}
+        self.partitions = set()
+        self.current_day = None
+
+    def setup(self):
+        with self.db.transaction() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            conn.execute('''
+                CREATE TABLE IF NOT EXISTS response_store (
+                    id INTEGER PRIMARY KEY,
+                    digest BLOB UNIQUE,
+                    body TEXT
+                )
+            ''')
+            self.partitions = set(self.list_partitions(conn))
+            
+            legacy = conn.execute("SELECT 1 FROM sqlite_master WHERE name = 'user_sessions' AND type = 'table'").fetchone()
+            if legacy:
+                self.migrate_legacy(conn)
+            
+            self.rebuild_view(conn)
+
+    def list_partitions(self, conn: sqlite3.Connection) -> List[str]:
+        names = conn.execute("SELECT name FROM sqlite_master WHERE type = 'table' AND name LIKE 'user_sessions!_%' ESCAPE '!'")
+        return [name for (name,) in names if name[len(self.PARTITION_PREFIX):].isdigit()]
+
+    def migrate_legacy(self, conn: sqlite3.Connection):
+        # The old append-only table is split into daily partitions once, then dropped
+        rows = conn.execute(
+            "SELECT user_input, bot_response, CAST(strftime('%s', timestamp) AS INTEGER), language FROM user_sessions"
+        ).fetchall()
+        conn.execute("DROP TABLE user_sessions")
+        self.write(conn, [(user_input, bot_response, timestamp or 0, language) for user_input, bot_response, timestamp, language in rows])
+
+    def partition_for(self, conn: sqlite3.Connection, timestamp: int) -> str:
+        table = self.PARTITION_PREFIX + time.strftime('%Y%m%d', time.gmtime(timestamp))
+        if table not in self.partitions:
+            conn.execute(f'''
+                CREATE TABLE IF NOT EXISTS {table} (
+                    id INTEGER PRIMARY KEY,
+                    user_input TEXT,
+                    response_id INTEGER,
+                    timestamp INTEGER,
+                    language TEXT
+                )
+            ''')
+            self.partitions.add(table)
+        return table
+
+    def response_id(self, conn: sqlite3.Connection, body: str, resolved: Dict) -> int:
+        # New digests go into resolved and reach the shared cache only once the batch commits
+        digest = hashlib.blake2b(body.encode('utf-8'), digest_size=16).digest()
+        response_id = self.response_ids.get(digest) or resolved.get(digest)
+        if response_id is not None:
+            return response_id
+        
+        row = conn.execute("SELECT id FROM response_store WHERE digest = ?", (digest,)).fetchone()
+        if row:
+            response_id = row[0]
+        else:
+            response_id = conn.execute("INSERT INTO response_store (digest, body) VALUES (?, ?)", (digest, body)).lastrowid
+        
+        resolved[digest] = response_id
+        return response_id
+
+    def remember(self, resolved: Dict):
+        if len(self.response_ids) + len(resolved) > self.cache_size:
+            self.response_ids.clear()
+        self.response_ids.update(resolved)
+
+    def reset(self):
+        # After a failed batch nothing cached can be trusted to match the database
+        self.response_ids.clear()
+        self.partitions.clear()
+        self.current_day = None
+
+    def write(self, conn: sqlite3.Connection, batch: List[Tuple]) -> Dict:
+        # batch rows are (user_input, bot_response, unix timestamp, language). Other workers may
+        # share the database, so the batch holds the write lock from its first statement.
+        if not conn.in_transaction:
+            conn.execute("BEGIN IMMEDIATE")
+        
+        partitions_before = len(self.partitions)
+        resolved = {}
+        rows = {}
+        for user_input, bot_response, timestamp, language in batch:
+            table = self.partition_for(conn, timestamp)
+            rows.setdefault(table, []).append((user_input, self.response_id(conn, bot_response, resolved), timestamp, language))
+        
+        for table, table_rows in rows.items():
+            conn.executemany(
+                f"INSERT INTO {table} (user_input, response_id, timestamp, language) VALUES (?, ?, ?, ?)",
+                table_rows
+            )
+        
+        today = time.strftime('%Y%m%d', time.gmtime())
+        if today != self.current_day:
+            # Another worker's retention may since have removed responses this cache points at
+            self.current_day = today
+            self.response_ids.clear()
+            self.apply_retention(conn, today)
+        elif len(self.partitions) != partitions_before:
+            self.rebuild_view(conn)
+        return resolved
+
+    def apply_retention(self, conn: sqlite3.Connection, today: str):
+        if self.retention_days > 0:
+            # Other workers create and drop partitions too, so the list is read afresh
+            self.partitions = set(self.list_partitions(conn))
+            cutoff = time.strftime('%Y%m%d', time.gmtime(time.time() - self.retention_days * 86400))
+            expired = [table for table in self.partitions if table[len(self.PARTITION_PREFIX):] < cutoff]
+            # Query totals count the retained logs, so a dropped day is taken off them. Before
+            # the counters exist (a legacy migration) they are backfilled from what is kept.
+            counters = conn.execute("SELECT 1 FROM sqlite_master WHERE name = 'stats_counters'").fetchone()
+            for table in expired:
+                if counters:
+                    conn.executemany(
+                        "UPDATE stats_counters SET value = value - ? WHERE name = 'queries' AND key = ?",
+                        [
+                            (count, language)
+                            for language, count in conn.execute(
+                                f"SELECT COALESCE(NULLIF(language, ''), 'unknown'), COUNT(*) FROM {table} GROUP BY 1"
+                            )
+                        ]
+                    )
+                conn.execute(f"DROP TABLE IF EXISTS {table}")
+                self.partitions.discard(table)
+            
+            if expired:
+                references = ' UNION '.join(f"SELECT response_id FROM {table}" for table in sorted(self.partitions))
+                if references:
+                    conn.execute(f"DELETE FROM response_store WHERE id NOT IN ({references})")
+                else:
+                    conn.execute("DELETE FROM response_store")
+                self.response_ids.clear()
+        
+        self.rebuild_view(conn)
+
+    def rebuild_view(self, conn: sqlite3.Connection):
+        self.partitions = set(self.list_partitions(conn))
+        selects = [
+            f"SELECT p.id, p.user_input, r.body AS bot_response, datetime(p.timestamp, 'unixepoch') AS timestamp, p.language "
+            f"FROM {table} p JOIN response_store r ON r.id = p.response_id"
+            for table in sorted(self.partitions)
+        ]
+        if not selects:
+            selects = ["SELECT NULL AS id, NULL AS user_input, NULL AS bot_response, NULL AS timestamp, NULL AS language WHERE 0"]
+        
+        conn.execute("DROP VIEW IF EXISTS user_sessions")
+        conn.execute(f"CREATE VIEW user_sessions AS {' UNION ALL '.join(selects)}")
+
+class InteractionLogger:
+    # Buffers interaction log rows on a bounded queue and writes them in batches from a
+    # background thread. A full queue either drops the entry or blocks the caller.
+    def __init__(self, db: HealthDatabase, flush_interval: float = 1.0, batch_size: int = 500,
+                 max_queue: int = 10000, overflow: str = 'drop', metrics: Metrics = None,
+                 archive: SessionArchive = None):
+        self.db = db
+        if archive is None:
+            archive = SessionArchive(db)
+            archive.setup()
+        self.archive = archive
+        self.metrics = metrics or Metrics(enabled=False)
+        self.flush_interval = flush_interval
+        self.batch_size = batch_size
+        self.overflow = overflow
+        self.queue = queue.Queue(maxsize=max_queue)
+        self.dropped = 0
+        self.stopping = threading.Event()
+        self.thread = threading.Thread(target=self.run, name='rhea-log-writer', daemon=True)
+        self.thread.start()
+
+    def log(self, user_input: str, bot_response: str, language: str):
+        entry = (user_input, bot_response, int(time.time()), language)
+        
+        if self.overflow == 'block':
+            self.queue.put(entry)
+            return
+        
+        try:
+            self.queue.put_nowait(entry)
+        except queue.Full:
+            self.dropped += 1
+
+    def run(self):
+        while not (self.stopping.is_set() and self.queue.empty()):
+            try:
+                batch = [self.queue.get(timeout=self.flush_interval)]
+            except queue.Empty:
+                continue
+            
+            # Keep collecting until the batch is full or the flush interval has passed
+            deadline = time.monotonic() + self.flush_interval
+            while len(batch) < self.batch_size and not self.stopping.is_set():
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(self.queue.get(timeout=remaining))
+                except queue.Empty:
+                    break
+            
+            while len(batch) < self.batch_size:
+                try:
+                    batch.append(self.queue.get_nowait())
+                except queue.Empty:
+                    break
+            
+            try:
+                self.write(batch)
+            except Exception as e:
+                logging.error(f"Error writing {len(batch)} interaction logs: {e}")
+            finally:
+                for _ in batch:
+                    self.queue.task_done()
+
+    def write(self, batch: List[Tuple]):
+        # Per-language query totals are bumped in the same transaction as the rows they count
+        languages = {}
+        for entry in batch:
+            language = entry[3] or 'unknown'
+            languages[language] = languages.get(language, 0) + 1
+        
+        try:
+            with self.metrics.timed('rhea_log_write_seconds'), self.db.transaction() as conn:
+                # Counted before the rows land, so retention in the same batch takes them off again
+                conn.execute("BEGIN IMMEDIATE")
+                conn.executemany(
+                    "INSERT INTO stats_counters (name, key, value) VALUES ('queries', ?, ?) "
+                    "ON CONFLICT (name, key) DO UPDATE SET value = value + excluded.value",
+                    list(languages.items())
+                )
+                resolved = self.archive.write(conn, batch)
+        except Exception:
+            self.archive.reset()
+            raise
+        self.archive.remember(resolved)
+
+    def log_many(self, interactions: List[Tuple[str, str, str]]):
+        # Bulk callers already hold a whole batch, so it is written straight away in one transaction
+        timestamp = int(time.time())
+        self.write([(user_input, bot_response, timestamp, language) for user_input, bot_response, language in interactions])
+
+    async def log_async(self, user_input: str, bot_response: str, language: str):
+        if self.overflow != 'block':
+            self.log(user_input, bot_response, language)
+            return
+        
+        entry = (user_input, bot_response, int(time.time()), language)
+        try:
+            self.queue.put_nowait(entry)
+        except queue.Full:
+            # Wait for room off the event loop so other requests keep being served
+            await asyncio.to_thread(self.queue.put, entry)
+
+    def flush(self):
+        self.queue.join()
+
+    def close(self):
+        self.stopping.set()
+        self.thread.join()
+
+class ResponseCache:
+    # LRU of finished responses; entries older than ttl seconds are treated as misses
+    def __init__(self, max_entries: int = 2048, ttl: float = 600):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.entries = OrderedDict()
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: Tuple):
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is None or time.monotonic() - entry[1] > self.ttl:
+                if entry is not None:
+                    del self.entries[key]
+                self.misses += 1
+                return None
+            
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def put(self, key: Tuple, response: str):
+        with self.lock:
+            self.entries[key] = (response, time.monotonic())
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+
+    def stats(self) -> Dict:
+        with self.lock:
+            lookups = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': self.hits / lookups if lookups else 0.0,
+                'size': len(self.entries)
+            }
+
+class ChatSession:
+    def __init__(self, session_id: str, language: str = 'english', history_size: int = 5):
+        self.session_id = session_id
+        self.language = language
+        self.history = deque(maxlen=history_size)
+        self.last_seen = time.monotonic()
+
+class SessionStore:
+    # Bounded LRU of chat sessions; idle sessions expire after ttl seconds
+    def __init__(self, max_sessions: int = 10000, ttl: float = 1800, history_size: int = 5):
+        self.max_sessions = max_sessions
+        self.ttl = ttl
+        self.history_size = history_size
+        self.sessions = OrderedDict()
+        self.lock = threading.Lock()
+
+    def get(self, session_id: str = None) -> ChatSession:
+        now = time.monotonic()
+        
+        with self.lock:
+            # Least recently used sessions sit at the front, so expired ones are popped first
+            while self.sessions:
+                oldest = next(iter(self.sessions.values()))
+                if now - oldest.last_seen <= self.ttl and len(self.sessions) < self.max_sessions:
+                    break
+                self.sessions.popitem(last=False)
+            
+            session = self.sessions.get(session_id) if session_id else None
+            if session is None:
+                session = ChatSession(session_id or uuid.uuid4().hex, history_size=self.history_size)
+                self.sessions[session.session_id] = session
+            else:
+                self.sessions.move_to_end(session.session_id)
+            
+            session.last_seen = now
+            return session
+
+    def __len__(self) -> int:
+        return len(self.sessions)
+
+class RHEAHealthBot:
+    WHO_URLS = [
+        "https://www.who.int/emergencies/diseases/novel-coronavirus-2019",
+        "https://www.who.int/news-room/fact-sheets",
+        "https://www.who.int/health-topics"
+    ]
+    
+    WHO_HEADERS = {
+        'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
+    }
+    
+    MOHFW_URLS = [
+        "https://www.mohfw.gov.in",
+        "https://www.mohfw.gov.in/index.php",
+        "https://main.mohfw.gov.in"
+    ]
+    
+    MOHFW_HEADERS = {
+        'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
+    }
+    
+    WORDFREQ_LANGUAGES = {'english': 'en', 'hindi': 'hi'}
+    
+    LANGUAGE_KEYWORDS = {
+        'hindi': ['hindi', 'हिंदी', 'भाषा बदलो', 'हिन्दी'],
+        'english': ['english', 'अंग्रेजी', 'english me']
+    }
+    
+    WHO_RULE = ExtractionRule(
+        ['div', 'article', 'section'],
+        class_pattern=r'(content|article|topic|fact)',
+        title_tags=['h1', 'h2', 'h3', 'h4'],
+        body_tags=['p', 'div'],
+        limit=5,
+        truncate=800
+    )
+    
+    MOHFW_RULE = ExtractionRule(
+        ['p', 'li', 'div'],
+        text_pattern=r'(health|disease|prevention|symptoms|vaccine|treatment)',
+        limit=10,
+        max_length=500,
+        title_prefix='MOHFW Health Update'
+    )
+    
+    GREETING_KEYWORDS = ['hello', 'hi', 'hey', 'नमस्ते', 'हैलो', 'start', 'शुरू']
+    
+    SEVERE_SYMPTOMS = frozenset(['chest_pain', 'shortness_of_breath', 'severe_abdominal_pain'])
+    
+    EMERGENCY_SYMPTOMS = frozenset(['chest_pain', 'shortness_of_breath'])
+
+    def __init__(self, db_path: str = None, knowledge_path: str = None):
+        self.db_path = db_path or os.environ.get('RHEA_DB_PATH')
+        self.knowledge_path = knowledge_path or os.environ.get('RHEA_KNOWLEDGE_PATH', KNOWLEDGE_PATH)
+        self.knowledge_mtime = self.knowledge_stamp()
+        self.knowledge = load_knowledge_pack(self.knowledge_path)
         self.symptoms_db = {}
         self.diseases_db = {}
         self.health_advisories = {}
+        self.data_source = 'empty'
+        self.source_status = {}
+        self.data_loaded_at = None
+        self.corpus_changed = False
+        self.corpus_version = 0
+        self.refresh_lock = threading.Lock()
+        self.closed = False
+        self.last_refresh_at = None
+        self.metrics = Metrics(enabled=os.environ.get('RHEA_METRICS', '1') != '0')
+        self.sources = self.build_sources(os.environ.get('RHEA_SOURCES_PATH'))
+        self.next_refresh = {name: 0.0 for name in self.sources}
+        self.response_cache = ResponseCache(
+            max_entries=int(os.environ.get('RHEA_CACHE_SIZE', '2048')),
+            ttl=float(os.environ.get('RHEA_CACHE_TTL', '600'))
+        )
+        self.fetcher = FetchEngine(metrics=self.metrics)
+        # Snapshot mode: one refresher process publishes corpus snapshots to this directory
+        # and API workers serve from them; the workers' own database then only holds logs
+        snapshot_dir = os.environ.get('RHEA_SNAPSHOT_DIR')
+        self.snapshot = CorpusSnapshot(
+            snapshot_dir,
+            keep=int(os.environ.get('RHEA_SNAPSHOT_KEEP', '3')),
+            mmap_size=int(os.environ.get('RHEA_SNAPSHOT_MMAP_MB', '256')) * 1024 * 1024
+        ) if snapshot_dir else None
+        self.db_executor = ThreadPoolExecutor(
+            max_workers=int(os.environ.get('RHEA_DB_WORKERS', '4')),
+            thread_name_prefix='rhea-db'
+        )
+        parse_workers = int(os.environ.get('RHEA_PARSE_WORKERS', '0'))
+        # Forking a process that already runs the log writer and fetch threads can copy a held
+        # lock into the child, so workers start from a clean forkserver (spawn where unavailable)
+        self.parse_executor = None
+        if parse_workers > 0:
+            start_method = 'forkserver' if 'forkserver' in multiprocessing.get_all_start_methods() else 'spawn'
+            self.parse_executor = ProcessPoolExecutor(
+                max_workers=parse_workers, mp_context=multiprocessing.get_context(start_method)
+            )
         self.setup_database()
-        self.current_language = 'english'
+        self.interaction_logger = InteractionLogger(
+            self.db,
+            flush_interval=float(os.environ.get('RHEA_LOG_FLUSH_INTERVAL', '1.0')),
+            max_queue=int(os.environ.get('RHEA_LOG_QUEUE_SIZE', '10000')),
+            overflow=os.environ.get('RHEA_LOG_OVERFLOW', 'drop'),
+            metrics=self.metrics,
+            archive=self.session_archive
+        )
+        self.default_session = ChatSession('cli')
         
         self.symptom_patterns = {
             'english': {
@@ -24,7 +1332,7 @@ class RHEAHealthBot:
                 'cough': ['cough', 'coughing', 'dry cough', 'wet cough', 'persistent cough'],
                 'sore_throat': ['sore throat', 'throat pain', 'throat hurts', 'pharyngitis'],
                 'fatigue': ['tired', 'fatigue', 'exhausted', 'weakness', 'weak', 'lethargic'],
-                'nausea': ['nausea', 'vomiting', 'sick', 'throw up', 'queasy'],
+                'nausea': ['nausea', 'vomiting', 'vomit', 'sick', 'throw up', 'throwing up', 'threw up', 'queasy'],
                 'diarrhea': ['diarrhea', 'loose stools', 'stomach upset', 'loose motions'],
                 'shortness_of_breath': ['shortness of breath', 'breathing problem', 'cant breathe', 'dyspnea'],
                 'chest_pain': ['chest pain', 'chest hurts', 'heart pain', 'angina'],
@@ -111,9 +1419,153 @@ class RHEAHealthBot:
                 'pneumonia': ['निमोनिया', 'फेफड़े का संक्रमण']
             }
         }
+        
+        # Typo tolerance: RHEA_FUZZY_MAX_EDITS=0 turns it off
+        self.fuzzy_max_distance = int(os.environ.get('RHEA_FUZZY_MAX_EDITS', '2'))
+        self.fuzzy_min_length = int(os.environ.get('RHEA_FUZZY_MIN_LENGTH', '5'))
+        self.fuzzy_budget = float(os.environ.get('RHEA_FUZZY_BUDGET_MS', '2')) / 1000
+        # Words at least this common (Zipf scale: 3 is once per million words) count as spelt right.
+        # Typos like "feaver" sit below 2, ordinary words like "skinning" above 2.5.
+        self.fuzzy_known_zipf = float(os.environ.get('RHEA_FUZZY_KNOWN_ZIPF', '2.0'))
+        if self.fuzzy_max_distance > 0 and zipf_frequency is None:
+            logging.warning("Typo tolerance needs wordfreq to tell real words from typos; it is turned off")
+            self.fuzzy_max_distance = 0
+        
+        self.build_matchers()
+        self.ensure_article_tags()
+        
+        # 'hybrid' blends keyword hits with nearest neighbours from a local vector index
+        self.retrieval = os.environ.get('RHEA_RETRIEVAL', 'keyword')
+        # Off-topic questions made of ordinary words score up to ~0.13 against the fallback
+        # corpus at 1024 dimensions, and real matches 0.2 and above
+        self.vector_min_score = float(os.environ.get('RHEA_VECTOR_MIN_SCORE', '0.18'))
+        self.vector_index = None
+        if self.retrieval == 'hybrid':
+            if np is None:
+                logging.warning("RHEA_RETRIEVAL=hybrid needs numpy; using keyword search only")
+            else:
+                vector_path = None if self.db.in_memory or self.db.temporary else f"{self.db_path}.vectors.npy"
+                self.vector_index = VectorIndex(vector_path, int(os.environ.get('RHEA_VECTOR_DIM', '1024')))
+                if self.vector_index.version != self.corpus_version:
+                    self.rebuild_vector_index()
+
+    @property
+    def current_language(self) -> str:
+        return self.default_session.language
+
+    @current_language.setter
+    def current_language(self, language: str):
+        self.default_session.language = language
+
+    def knowledge_stamp(self) -> Optional[int]:
+        try:
+            return os.stat(self.knowledge_path).st_mtime_ns
+        except OSError:
+            return None
+
+    def reload_knowledge(self):
+        # The stamp is taken first so a broken pack is reported once, not on every poll
+        self.knowledge_mtime = self.knowledge_stamp()
+        knowledge = load_knowledge_pack(self.knowledge_path)
+        self.knowledge = knowledge
+        self.build_matchers()
+        # Cached replies quote the old advice and emergency text
+        self.response_cache.clear()
+
+    def reload_knowledge_if_changed(self) -> bool:
+        if self.knowledge_stamp() == self.knowledge_mtime:
+            return False
+        
+        try:
+            self.reload_knowledge()
+        except (OSError, ValueError, KeyError) as e:
+            logging.error(f"Keeping the current knowledge pack, {self.knowledge_path} failed to load: {e}")
+            return False
+        
+        print(f"Reloaded knowledge pack from {self.knowledge_path}")
+        return True
+
+    def build_matchers(self):
+        self.matchers = {language: self.build_matcher(language) for language in self.symptom_patterns}
+        self.fuzzy_indexes = {}
+        if self.fuzzy_max_distance > 0:
+            # Only symptom and disease words are correction targets; every keyword as typed,
+            # commands and emergency words included, is left alone
+            self.fuzzy_indexes = {
+                language: FuzzyIndex(
+                    {
+                        token
+                        for table in (self.symptom_patterns[language], self.disease_keywords[language])
+                        for keywords in table.values()
+                        for keyword in keywords
+                        for token in tokenize(keyword)
+                    },
+                    self.fuzzy_max_distance,
+                    self.fuzzy_min_length,
+                    ignore=matcher.vocabulary,
+                    known_word=partial(self.is_known_word, language)
+                )
+                for language, matcher in self.matchers.items()
+            }
+            # The word lists load on first use, ~100 ms that would otherwise land on a request
+            for language in self.fuzzy_indexes:
+                self.is_known_word(language, language)
+
+    def is_known_word(self, language: str, token: str) -> bool:
+        return zipf_frequency(token, self.WORDFREQ_LANGUAGES[language]) >= self.fuzzy_known_zipf
+
+    def build_matcher(self, language: str) -> KeywordMatcher:
+        matcher = KeywordMatcher()
+        
+        for symptom, keywords in self.symptom_patterns[language].items():
+            for keyword in keywords:
+                matcher.add(keyword, 'symptom', symptom)
+        
+        for disease, keywords in self.disease_keywords[language].items():
+            for keyword in keywords:
+                matcher.add(keyword, 'disease', disease)
+        
+        for keyword in self.get_emergency_keywords(language):
+            matcher.add(keyword, 'emergency', keyword)
+        
+        # Commands are recognised in either language
+        for target_language, keywords in self.LANGUAGE_KEYWORDS.items():
+            for keyword in keywords:
+                matcher.add(keyword, 'language', target_language)
+        
+        for keyword in self.GREETING_KEYWORDS:
+            matcher.add(keyword, 'greeting', 'greeting')
+        
+        return matcher.compile()
+
+    def analyze_message(self, text: str, language: str = None) -> Dict:
+        return self.analyze_tokens(tokenize(text), language)
+
+    @timed_stage('analyze')
+    def analyze_tokens(self, tokens: List[str], language: str = None) -> Dict:
+        language = language or self.current_language
+        matches = self.matchers[language].scan(tokens)
+        
+        # Misspelt words ("feaver", "hedache") are snapped to the nearest keyword and the message
+        # rescanned. Only symptoms and diseases are taken from the rescan: emergencies, greetings
+        # and language switches act on the words as typed.
+        if language in self.fuzzy_indexes:
+            corrected = self.fuzzy_indexes[language].correct(tokens, self.fuzzy_budget)
+            if corrected != tokens:
+                rescanned = self.matchers[language].scan(corrected)
+                matches = dict(matches, symptom=rescanned.get('symptom', []), disease=rescanned.get('disease', []))
+        return {
+            'tokens': tokens,
+            'symptoms': matches.get('symptom', []),
+            'diseases': matches.get('disease', []),
+            'emergency_keywords': matches.get('emergency', []),
+            'language_switch': matches['language'][0] if 'language' in matches else None,
+            'greeting': 'greeting' in matches
+        }
 
     def setup_database(self):
-        self.conn = sqlite3.connect(':memory:')
+        self.db = HealthDatabase(self.db_path)
+        self.conn = self.db.writer
         cursor = self.conn.cursor()
         
         cursor.execute('''
@@ -124,10 +1576,31 @@ class RHEAHealthBot:
                 title TEXT,
                 content TEXT,
                 keywords TEXT,
+                content_hash TEXT,
                 last_updated TIMESTAMP DEFAULT CURRENT_TIMESTAMP
             )
         ''')
         
+        self.migrate_health_data(cursor)
+        cursor.execute("CREATE UNIQUE INDEX IF NOT EXISTS health_data_source_title ON health_data (source, title)")
+        
+        # Disease and symptom tags found in each article's text, for indexed lookups by tag
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS article_tags (
+                tag_type TEXT,
+                tag TEXT,
+                article_id INTEGER,
+                weight INTEGER,
+                PRIMARY KEY (tag_type, tag, article_id)
+            ) WITHOUT ROWID
+        ''')
+        cursor.execute("CREATE INDEX IF NOT EXISTS article_tags_article ON article_tags (article_id)")
+        cursor.execute('''
+            CREATE TRIGGER IF NOT EXISTS health_data_tags_ad AFTER DELETE ON health_data BEGIN
+                DELETE FROM article_tags WHERE article_id = old.id;
+            END
+        ''')
+        
         cursor.execute('''
             CREATE TABLE IF NOT EXISTS symptoms (
                 id INTEGER PRIMARY KEY,
@@ -140,104 +1613,325 @@ class RHEAHealthBot:
         ''')
         
         cursor.execute('''
-            CREATE TABLE IF NOT EXISTS user_sessions (
-                id INTEGER PRIMARY KEY,
-                user_input TEXT,
-                bot_response TEXT,
-                timestamp TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                language TEXT
+            CREATE TABLE IF NOT EXISTS source_cache (
+                url TEXT PRIMARY KEY,
+                etag TEXT,
+                last_modified TEXT,
+                content_hash TEXT,
+                articles TEXT,
+                fetched_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            )
+        ''')
+        
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS corpus_meta (
+                key TEXT PRIMARY KEY,
+                value TEXT
             )
         ''')
         
         self.conn.commit()
+        self.session_archive = SessionArchive(self.db, int(os.environ.get('RHEA_LOG_RETENTION_DAYS', '30')))
+        self.session_archive.setup()
+        self.setup_stats_counters()
+        self.fts_enabled = self.setup_search_index()
+        self.restore_corpus_state()
 
-    def fetch_who_data(self) -> Dict:
-        try:
-            who_data = {}
+    def migrate_health_data(self, cursor: sqlite3.Cursor):
+        # Corpus files written by the append-only loader lack content_hash and may hold duplicates
+        columns = [row[1] for row in cursor.execute("PRAGMA table_info(health_data)")]
+        if 'content_hash' in columns:
+            return
+        
+        cursor.execute("ALTER TABLE health_data ADD COLUMN content_hash TEXT")
+        cursor.execute("DELETE FROM health_data WHERE id NOT IN (SELECT MAX(id) FROM health_data GROUP BY source, title)")
+
+    def setup_stats_counters(self):
+        # Running totals behind get_statistics, so it never scans user_sessions or health_data.
+        # Query counts are bumped by the log writer; article counts follow health_data via triggers.
+        with self.db.transaction() as conn:
+            cursor = conn.cursor()
+            cursor.execute("SELECT 1 FROM sqlite_master WHERE name = 'stats_counters'")
+            counters_exist = cursor.fetchone() is not None
             
-            who_urls = [
-                "https://www.who.int/emergencies/diseases/novel-coronavirus-2019",
-                "https://www.who.int/news-room/fact-sheets",
-                "https://www.who.int/health-topics"
-            ]
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS stats_counters (
+                    name TEXT,
+                    key TEXT,
+                    value INTEGER,
+                    PRIMARY KEY (name, key)
+                )
+            ''')
+            cursor.execute('''
+                CREATE TRIGGER IF NOT EXISTS health_data_stats_ai AFTER INSERT ON health_data BEGIN
+                    INSERT INTO stats_counters (name, key, value) VALUES ('articles', new.source, 1)
+                    ON CONFLICT (name, key) DO UPDATE SET value = value + 1;
+                END
+            ''')
+            cursor.execute('''
+                CREATE TRIGGER IF NOT EXISTS health_data_stats_ad AFTER DELETE ON health_data BEGIN
+                    UPDATE stats_counters SET value = value - 1 WHERE name = 'articles' AND key = old.source;
+                END
+            ''')
             
-            headers = {
-                'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-            }
+            # A database from before the counters existed is counted once
+            if not counters_exist:
+                cursor.execute(
+                    "INSERT INTO stats_counters (name, key, value) "
+                    "SELECT 'queries', COALESCE(NULLIF(language, ''), 'unknown'), COUNT(*) FROM user_sessions GROUP BY 2"
+                )
+                cursor.execute(
+                    "INSERT INTO stats_counters (name, key, value) "
+                    "SELECT 'articles', source, COUNT(*) FROM health_data GROUP BY source"
+                )
+
+    def setup_search_index(self) -> bool:
+        with self.db.transaction() as conn:
+            cursor = conn.cursor()
+            cursor.execute("SELECT 1 FROM sqlite_master WHERE name = 'health_data_fts'")
+            index_exists = cursor.fetchone() is not None
             
-            for url in who_urls:
-                try:
-                    response = requests.get(url, headers=headers, timeout=15)
-                    soup = BeautifulSoup(response.content, 'html.parser')
-                    
-                    articles = soup.find_all(['div', 'article', 'section'], class_=re.compile(r'(content|article|topic|fact)', re.I))
-                    
-                    for article in articles[:5]:
-                        title_elem = article.find(['h1', 'h2', 'h3', 'h4'])
-                        if title_elem:
-                            title = title_elem.get_text(strip=True)
-                            content_elem = article.find(['p', 'div'])
-                            if content_elem:
-                                content = content_elem.get_text(strip=True)[:800]
-                                if len(content) > 100 and title not in who_data:
-                                    who_data[title] = content
-                    
-                    time.sleep(1)
-                    
-                except Exception as e:
-                    continue
+            try:
+                cursor.execute('''
+                    CREATE VIRTUAL TABLE IF NOT EXISTS health_data_fts USING fts5(
+                        title, content, keywords,
+                        content='health_data', content_rowid='id'
+                    )
+                ''')
+            except sqlite3.OperationalError as e:
+                logging.warning(f"FTS5 unavailable, falling back to LIKE search: {e}")
+                return False
             
-            if not who_data:
-                who_data = self.get_fallback_who_data()
-                
-            return who_data
+            # Triggers keep the external-content index in step with every write to health_data
+            cursor.execute('''
+                CREATE TRIGGER IF NOT EXISTS health_data_ai AFTER INSERT ON health_data BEGIN
+                    INSERT INTO health_data_fts (rowid, title, content, keywords)
+                    VALUES (new.id, new.title, new.content, new.keywords);
+                END
+            ''')
+            cursor.execute('''
+                CREATE TRIGGER IF NOT EXISTS health_data_ad AFTER DELETE ON health_data BEGIN
+                    INSERT INTO health_data_fts (health_data_fts, rowid, title, content, keywords)
+                    VALUES ('delete', old.id, old.title, old.content, old.keywords);
+                END
+            ''')
+            cursor.execute('''
+                CREATE TRIGGER IF NOT EXISTS health_data_au AFTER UPDATE ON health_data BEGIN
+                    INSERT INTO health_data_fts (health_data_fts, rowid, title, content, keywords)
+                    VALUES ('delete', old.id, old.title, old.content, old.keywords);
+                    INSERT INTO health_data_fts (rowid, title, content, keywords)
+                    VALUES (new.id, new.title, new.content, new.keywords);
+                END
+            ''')
             
-        except Exception as e:
-            logging.error(f"Error fetching WHO data: {e}")
-            return self.get_fallback_who_data()
+            # A corpus persisted before the index existed has to be indexed once
+            if not index_exists:
+                cursor.execute("INSERT INTO health_data_fts (health_data_fts) VALUES ('rebuild')")
+            
+            return True
+
+    def tag_article(self, title: str, content: str) -> List[Tuple[str, str, int]]:
+        # Articles are tagged in every language so Hindi and English queries reach the same rows
+        title_tokens = tokenize(title)
+        content_tokens = tokenize(content)
+        tags = {}
+        
+        for matcher in self.matchers.values():
+            for weight, tokens in ((2, title_tokens), (1, content_tokens)):
+                matches = matcher.scan(tokens)
+                for tag_type in ('disease', 'symptom'):
+                    for tag in matches.get(tag_type, []):
+                        tags[(tag_type, tag)] = max(weight, tags.get((tag_type, tag), 0))
+        
+        return [(tag_type, tag, weight) for (tag_type, tag), weight in tags.items()]
+
+    def write_article_tags(self, conn: sqlite3.Connection, article_id: int, tags: List[Tuple[str, str, int]]):
+        conn.execute("DELETE FROM article_tags WHERE article_id = ?", (article_id,))
+        conn.executemany(
+            "INSERT INTO article_tags (tag_type, tag, article_id, weight) VALUES (?, ?, ?, ?)",
+            [(tag_type, tag, article_id, weight) for tag_type, tag, weight in tags]
+        )
+
+    def ensure_article_tags(self):
+        # Re-tag the stored corpus when it predates tagging or the keyword lists have changed
+        vocabulary = json.dumps([self.symptom_patterns, self.disease_keywords], sort_keys=True, ensure_ascii=False)
+        vocabulary_hash = hashlib.sha256(vocabulary.encode('utf-8')).hexdigest()
+        
+        with self.db.transaction() as conn:
+            row = conn.execute("SELECT value FROM corpus_meta WHERE key = 'tag_vocabulary'").fetchone()
+            if row and row[0] == vocabulary_hash:
+                return
+            
+            for article_id, title, content in conn.execute("SELECT id, title, content FROM health_data").fetchall():
+                tags = self.tag_article(title, content)
+                conn.execute(
+                    "UPDATE health_data SET keywords = ? WHERE id = ?",
+                    (self.tag_keywords(tags), article_id)
+                )
+                self.write_article_tags(conn, article_id, tags)
+            
+            conn.execute(
+                "INSERT OR REPLACE INTO corpus_meta (key, value) VALUES ('tag_vocabulary', ?)",
+                (vocabulary_hash,)
+            )
+
+    def tag_keywords(self, tags: List[Tuple[str, str, int]]) -> str:
+        return ' '.join(tag for _, tag, _ in tags)
+
+    def fts_query(self, terms: List[str]) -> str:
+        return ' OR '.join('"{}"*'.format(term.replace('"', '""')) for term in terms)
+
+    def corpus_reader(self):
+        # A loaded snapshot replaces the local corpus for reads; logs and counters stay local
+        if self.snapshot is not None and self.snapshot.path is not None:
+            return self.snapshot.reader()
+        return self.db.reader()
+
+    def restore_corpus_state(self):
+        # A file-backed database may already hold a corpus from an earlier run or another worker
+        with self.corpus_reader() as conn:
+            meta = dict(conn.execute("SELECT key, value FROM corpus_meta").fetchall())
+            article_count = conn.execute("SELECT COUNT(*) FROM health_data").fetchone()[0]
+        
+        if article_count and 'data_source' in meta:
+            self.data_source = meta['data_source']
+            self.source_status = json.loads(meta.get('source_status', '{}'))
+            self.corpus_version = int(meta.get('corpus_version', 0))
+            if meta.get('loaded_at'):
+                self.data_loaded_at = datetime.fromisoformat(meta['loaded_at'])
+
+    def conditional_headers(self, url: str, headers: Dict) -> Dict:
+        with self.db.reader() as conn:
+            cached = conn.execute(
+                "SELECT etag, last_modified FROM source_cache WHERE url = ?", (url,)
+            ).fetchone()
+        
+        headers = dict(headers)
+        if cached:
+            etag, last_modified = cached
+            if etag:
+                headers['If-None-Match'] = etag
+            if last_modified:
+                headers['If-Modified-Since'] = last_modified
+        return headers
+
+    def get_page_articles(self, url: str, response: requests.Response, parse_page) -> Tuple[Dict, bool]:
+        with self.db.reader() as conn:
+            cached = conn.execute(
+                "SELECT content_hash, articles FROM source_cache WHERE url = ?", (url,)
+            ).fetchone()
+        
+        if response.status_code == 304:
+            if cached:
+                return json.loads(cached[1]), False
+            return {}, False
+        
+        content_hash = hashlib.sha256(response.content).hexdigest()
+        if cached and cached[0] == content_hash:
+            return json.loads(cached[1]), False
+        
+        articles = parse_page(response.content)
+        with self.db.transaction() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO source_cache (url, etag, last_modified, content_hash, articles, fetched_at) VALUES (?, ?, ?, ?, ?, CURRENT_TIMESTAMP)",
+                (url, response.headers.get('ETag'), response.headers.get('Last-Modified'), content_hash, json.dumps(articles, ensure_ascii=False))
+            )
+        return articles, True
+
+    def build_sources(self, path: str = None) -> Dict[str, HealthSource]:
+        # MOHFW advisories change more often than WHO fact sheets, so it is polled first and more often
+        sources = {
+            'MOHFW': HealthSource(
+                'MOHFW', self.MOHFW_URLS, self.MOHFW_HEADERS, rule=self.MOHFW_RULE, mode='first',
+                category='advisory', refresh_interval=3600, priority=10, fallback=self.get_fallback_mohfw_data
+            ),
+            'WHO': HealthSource(
+                'WHO', self.WHO_URLS, self.WHO_HEADERS, rule=self.WHO_RULE,
+                category='general', refresh_interval=6 * 3600, priority=5, fallback=self.get_fallback_who_data
+            )
+        }
+        
+        # Extra feeds (state health departments, local mirrors) are declared in JSON;
+        # an entry with a built-in name replaces that source
+        if path:
+            with open(path, encoding='utf-8') as f:
+                for spec in json.load(f):
+                    source = HealthSource.from_dict(spec)
+                    sources[source.name] = source
+        
+        return sources
+
+    def due_sources(self, now: float = None) -> List[HealthSource]:
+        now = time.monotonic() if now is None else now
+        due = [source for name, source in self.sources.items() if self.next_refresh[name] <= now]
+        return sorted(due, key=lambda source: -source.priority)
+
+    def next_refresh_delay(self) -> float:
+        return max(0.0, min(self.next_refresh.values(), default=0.0) - time.monotonic())
+
+    def fetch_who_data(self) -> Dict:
+        return self.fetch_source_data(self.sources['WHO'])
 
     def fetch_mohfw_data(self) -> Dict:
+        return self.fetch_source_data(self.sources['MOHFW'])
+
+    def fetch_source_data(self, source: HealthSource) -> Dict:
+        return self.fetch_source_live_data(source) or source.get_fallback()
+
+    def fetch_source_live_data(self, source: HealthSource, responses: Dict = None) -> Dict:
         try:
-            mohfw_data = {}
+            source_data = {}
             
-            mohfw_urls = [
-                "https://www.mohfw.gov.in",
-                "https://www.mohfw.gov.in/index.php",
-                "https://main.mohfw.gov.in"
-            ]
+            if responses is None:
+                responses = self.fetcher.fetch_all(self.source_targets([source]), source.fetch_budget())
             
-            headers = {
-                'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
-            }
-            
-            for url in mohfw_urls:
+            for url in source.urls:
+                if url not in responses:
+                    continue
+                
                 try:
-                    response = requests.get(url, headers=headers, timeout=15)
-                    soup = BeautifulSoup(response.content, 'html.parser')
-                    
-                    news_sections = soup.find_all(['div', 'section'], class_=re.compile(r'(news|update|advisory)', re.I))
-                    news_items = soup.find_all(['p', 'li', 'div'], text=re.compile(r'(health|disease|prevention|symptoms|vaccine|treatment)', re.I))
-                    
-                    for item in news_items[:10]:
-                        text = item.get_text(strip=True)
-                        if 100 < len(text) < 500:
-                            title = f"MOHFW Health Update {len(mohfw_data) + 1}"
-                            mohfw_data[title] = text
-                    
-                    time.sleep(1)
-                    break
-                    
-                except Exception:
+                    articles, changed = self.get_page_articles(url, responses[url], partial(self.parse_source_page, source))
+                    self.corpus_changed = self.corpus_changed or changed
+                except Exception as e:
+                    logging.warning(f"Error parsing {url} for {source.name}: {e}")
                     continue
-            
-            if not mohfw_data:
-                mohfw_data = self.get_fallback_mohfw_data()
                 
-            return mohfw_data
+                for title, content in articles.items():
+                    if title not in source_data:
+                        source_data[title] = content
+                
+                if source.mode == 'first' and source_data:
+                    break
+            
+            return source_data
             
         except Exception as e:
-            logging.error(f"Error fetching MOHFW data: {e}")
-            return self.get_fallback_mohfw_data()
+            logging.error(f"Error fetching {source.name} data: {e}")
+            return {}
+
+    def source_targets(self, sources: List[HealthSource]) -> List[Tuple]:
+        return [
+            (url, self.conditional_headers(url, source.headers), source.timeout, source.gate)
+            for source in sources for url in source.urls
+        ]
+
+    def parse_source_page(self, source: HealthSource, content: bytes) -> Dict:
+        with self.metrics.timed('rhea_parse_seconds', source=source.name):
+            if source.feed_format == 'html':
+                return self.parse_html(source.rule, content)
+            return source.parse_feed(content)
+
+    def parse_who_page(self, content: bytes) -> Dict:
+        return self.parse_html(self.WHO_RULE, content)
+
+    def parse_mohfw_page(self, content: bytes) -> Dict:
+        return self.parse_html(self.MOHFW_RULE, content)
+
+    def parse_html(self, rule: ExtractionRule, content: bytes) -> Dict:
+        # A parse worker keeps the CPU-heavy tree building off the GIL that request threads share
+        if self.parse_executor is None:
+            return parse_page(rule, content)
+        return self.parse_executor.submit(parse_page, rule, content, HTML_PARSER).result()
 
     def get_fallback_who_data(self) -> Dict:
         return {
@@ -263,373 +1957,714 @@ class RHEAHealthBot:
             "Antimicrobial Resistance": "Use antibiotics responsibly. Take complete course as prescribed, don't share antibiotics, and avoid self-medication to prevent resistance."
         }
 
-    def recognize_symptoms(self, text: str) -> List[str]:
-        text_lower = text.lower()
-        detected_symptoms = []
-        
-        patterns = self.symptom_patterns[self.current_language]
-        
-        for symptom, keywords in patterns.items():
-            for keyword in keywords:
-                if keyword.lower() in text_lower:
-                    if symptom not in detected_symptoms:
-                        detected_symptoms.append(symptom)
-                    break
-        
-        return detected_symptoms
+    def recognize_symptoms(self, text: str, language: str = None) -> List[str]:
+        return self.analyze_message(text, language)['symptoms']
 
-    def recognize_diseases(self, text: str) -> List[str]:
-        text_lower = text.lower()
-        detected_diseases = []
-        
-        keywords = self.disease_keywords[self.current_language]
-        
-        for disease, disease_keywords in keywords.items():
-            for keyword in disease_keywords:
-                if keyword.lower() in text_lower:
-                    if disease not in detected_diseases:
-                        detected_diseases.append(disease)
-                    break
-        
-        return detected_diseases
+    def recognize_diseases(self, text: str, language: str = None) -> List[str]:
+        return self.analyze_message(text, language)['diseases']
 
-    def get_symptom_advice(self, symptoms: List[str]) -> Tuple[Dict, bool]:
-        advice = {}
-        emergency_symptoms = ['chest_pain', 'shortness_of_breath', 'severe_abdominal_pain']
-        severe_symptoms = []
-        
-        symptom_info = {
-            'fever': {
-                'english': "Monitor temperature regularly. Stay hydrated with fluids. Rest adequately. Take paracetamol if needed. Seek medical help if fever exceeds 103°F (39.4°C) or persists for more than 3 days.",
-                'hindi': "तापमान की नियमित निगरानी करें। तरल पदार्थ पिएं। पर्याप्त आराम करें। जरूरत पड़ने पर पेरासिटामोल लें। यदि बुखार 103°F (39.4°C) से अधिक हो या 3 दिन से अधिक बना रहे तो चिकित्सा सहायता लें।"
-            },
-            'headache': {
-                'english': "Rest in quiet, dark room. Apply cold or warm compress. Stay hydrated. Avoid triggers like stress, bright lights. Take over-the-counter pain relief if needed. See doctor if severe, sudden, or with fever.",
-                'hindi': "शांत, अंधेरे कमरे में आराम करें। ठंडी या गर्म सिकाई करें। हाइड्रेटेड रहें। तनाव, तेज रोशनी जैसे ट्रिगर से बचें। यदि गंभीर, अचानक या बुखार के साथ हो तो डॉक्टर से मिलें।"
-            },
-            'cough': {
-                'english': "Stay hydrated with warm liquids. Use honey for soothing effect. Avoid smoke and pollutants. Use humidifier. See doctor if cough persists more than 2 weeks, produces blood, or with high fever.",
-                'hindi': "गर्म तरल पदार्थ पिएं। शहद का इस्तेमाल करें। धुआं और प्रदूषण से बचें। ह्यूमिडिफायर का उपयोग करें। यदि खांसी 2 सप्ताह से अधिक बनी रहे, खून आए या तेज बुखार हो तो डॉक्टर से मिलें।"
-            },
-            'sore_throat': {
-                'english': "Gargle with warm salt water. Drink warm liquids. Use throat lozenges. Avoid irritants. Rest your voice. See doctor if severe pain, difficulty swallowing, or lasts more than a week.",
-                'hindi': "नमक के गर्म पानी से गरारे करें। गर्म तरल पदार्थ पिएं। गले की गोलियां लें। परेशान करने वाली चीजों से बचें। आवाज को आराम दें। यदि गंभीर दर्द, निगलने में कठिनाई या एक सप्ताह से अधिक हो तो डॉक्टर से मिलें।"
-            },
-            'fatigue': {
-                'english': "Get adequate sleep (7-9 hours). Eat balanced diet. Exercise regularly but moderately. Manage stress. Stay hydrated. Consult doctor if persistent fatigue affects daily activities.",
-                'hindi': "पर्याप्त नींद लें (7-9 घंटे)। संतुलित आहार लें। नियमित लेकिन मध्यम व्यायाम करें। तनाव को नियंत्रित करें। हाइड्रेटेड रहें। यदि लगातार थकान दैनिक गतिविधियों को प्रभावित करे तो डॉक्टर से सलाह लें।"
-            },
-            'nausea': {
-                'english': "Eat small, frequent meals. Avoid spicy, fatty foods. Stay hydrated with clear fluids. Try ginger or mint. Rest after eating. Seek medical help if persistent vomiting or dehydration signs.",
-                'hindi': "थोड़ा-थोड़ा, बार-बार खाएं। मसालेदार, चिकना भोजन न लें। साफ तरल पदार्थ पिएं। अदरक या पुदीना आजमाएं। खाने के बाद आराम करें। लगातार उल्टी या निर्जलीकरण के लक्षण हों तो चिकित्सा सहायता लें।"
-            },
-            'diarrhea': {
-                'english': "Stay hydrated with ORS, clear fluids. Eat BRAT diet (Banana, Rice, Apple sauce, Toast). Avoid dairy, caffeine, alcohol. Take probiotics. See doctor if blood in stool, high fever, or severe dehydration.",
-                'hindi': "ORS, साफ तरल पदार्थ से हाइड्रेटेड रहें। BRAT आहार लें (केला, चावल, सेब की चटनी, टोस्ट)। डेयरी, कैफीन, शराब से बचें। प्रोबायोटिक्स लें। मल में खून, तेज बुखार या गंभीर निर्जलीकरण हो तो डॉक्टर से मिलें।"
-            },
-            'chest_pain': {
-                'english': "EMERGENCY: Seek immediate medical attention. Chest pain could indicate heart attack, pulmonary embolism, or other serious conditions. Don't ignore or delay treatment.",
-                'hindi': "आपातकाल: तुरंत चिकित्सा सहायता लें। छाती का दर्द हार्ट अटैक, पल्मोनरी एम्बोलिज्म या अन्य गंभीर स्थितियों का संकेत हो सकता है। इसे नजरअंदाज न करें या इलाज में देरी न करें।"
-            },
-            'shortness_of_breath': {
-                'english': "EMERGENCY: Seek immediate medical help. Difficulty breathing requires urgent evaluation. Could indicate respiratory, cardiac, or other serious conditions.",
-                'hindi': "आपातकाल: तुरंत चिकित्सा सहायता लें। सांस लेने में कठिनाई तत्काल मूल्यांकन की आवश्यकता है। यह श्वसन, हृदय या अन्य गंभीर स्थितियों का संकेत हो सकता है।"
-            },
-            'dizziness': {
-                'english': "Sit or lie down immediately. Stay hydrated. Avoid sudden movements. Check blood pressure. Avoid driving. See doctor if frequent episodes, with chest pain, or after head injury.",
-                'hindi': "तुरंत बैठ या लेट जाएं। हाइड्रेटेड रहें। अचानक हलचल से बचें। रक्तचाप जांचें। गाड़ी न चलाएं। बार-बार चक्कर आना, छाती दर्द के साथ या सिर की चोट के बाद हो तो डॉक्टर से मिलें।"
-            },
-            'body_ache': {
-                'english': "Rest and avoid strenuous activities. Apply hot or cold compress. Take over-the-counter pain relievers. Stay hydrated. Gentle stretching may help. See doctor if severe or persistent pain.",
-                'hindi': "आराम करें और कड़ी मेहनत से बचें। गर्म या ठंडी सिकाई करें। दर्द निवारक दवा लें। हाइड्रेटेड रहें। हल्की स्ट्रेचिंग मदद कर सकती है। गंभीर या लगातार दर्द हो तो डॉक्टर से मिलें।"
-            }
+    def get_symptom_advice(self, symptoms: List[str], language: str = None) -> Tuple[Dict, bool]:
+        knowledge = self.knowledge[language or self.current_language]
+        advice = {
+            symptom: knowledge['symptom_advice'].get(symptom, knowledge['general_advice'])
+            for symptom in symptoms
         }
         
-        for symptom in symptoms:
-            if symptom in emergency_symptoms:
-                severe_symptoms.append(symptom)
-            
-            if symptom in symptom_info:
-                advice[symptom] = symptom_info[symptom][self.current_language]
-            else:
-                if self.current_language == 'hindi':
-                    advice[symptom] = "सामान्य सिफारिश: लक्षणों की निगरानी करें और यदि ये बने रहें तो स्वास्थ्य प्रदाता से सलाह लें।"
-                else:
-                    advice[symptom] = "General recommendation: Monitor symptoms and consult healthcare provider if they persist."
-        
-        return advice, len(severe_symptoms) > 0
+        return advice, any(symptom in self.SEVERE_SYMPTOMS for symptom in symptoms)
 
     def get_disease_info(self, diseases: List[str]) -> str:
-        cursor = self.conn.cursor()
-        info = ""
+        return self.format_disease_info(diseases, self.get_disease_articles(diseases))
+
+    @timed_stage('disease_lookup')
+    def get_disease_articles(self, diseases: List[str]) -> Dict[str, List[Tuple]]:
+        # One statement for every distinct disease, each branch keeping its own top two articles
+        diseases = list(dict.fromkeys(diseases))
+        if not diseases:
+            return {}
         
-        for disease in diseases:
-            cursor.execute(
-                "SELECT title, content FROM health_data WHERE title LIKE ? OR content LIKE ? OR keywords LIKE ? LIMIT 2",
-                (f"%{disease}%", f"%{disease}%", f"%{disease}%")
+        with self.corpus_reader() as conn:
+            # Tagged articles are a primary-key range scan; title mentions rank first
+            branch = (
+                "SELECT * FROM (SELECT ? AS disease, h.title, h.content FROM article_tags t "
+                "JOIN health_data h ON h.id = t.article_id WHERE t.tag_type = 'disease' AND t.tag = ? "
+                "ORDER BY t.weight DESC, h.id LIMIT 2)"
             )
-            results = cursor.fetchall()
-            
-            if results:
-                for title, content in results:
-                    info += f"\n📋 {title}\n{content[:300]}...\n"
+            params = [param for disease in diseases for param in (disease, disease)]
+            rows = conn.execute(' UNION ALL '.join([branch] * len(diseases)), params).fetchall()
             
-        return info
-
-    def set_language(self, language: str):
-        if language.lower() in ['hindi', 'हिंदी', 'hin', 'hi']:
-            self.current_language = 'hindi'
-        elif language.lower() in ['english', 'eng', 'en']:
-            self.current_language = 'english'
+            tagged = {row[0] for row in rows}
+            untagged = [disease for disease in diseases if disease not in tagged]
+            if untagged:
+                rows += self.search_disease_articles(conn, untagged)
         
-        return self.translations[self.current_language]['language_set']
+        articles = {}
+        for disease, title, content in rows:
+            articles.setdefault(disease, []).append((title, content))
+        return {disease: articles[disease] for disease in diseases if disease in articles}
 
-    def get_health_data(self):
-        print(self.translations[self.current_language]['fetching_data'])
-        
-        who_data = self.fetch_who_data()
-        mohfw_data = self.fetch_mohfw_data()
-        
-        cursor = self.conn.cursor()
+    def search_disease_articles(self, conn: sqlite3.Connection, diseases: List[str]) -> List[Tuple]:
+        # Text search for diseases no article is tagged with
+        rows = None
         
-        for title, content in who_data.items():
-            keywords = ' '.join([k for keywords_list in self.disease_keywords[self.current_language].values() for k in keywords_list])
-            cursor.execute(
-                "INSERT INTO health_data (source, category, title, content, keywords) VALUES (?, ?, ?, ?, ?)",
-                ('WHO', 'general', title, content, keywords)
+        if self.fts_enabled:
+            branch = (
+                "SELECT * FROM (SELECT ? AS disease, h.title, h.content FROM health_data_fts "
+                "JOIN health_data h ON h.id = health_data_fts.rowid WHERE health_data_fts MATCH ? "
+                "ORDER BY bm25(health_data_fts, 10.0, 1.0, 0.5) LIMIT 2)"
             )
+            params = [param for disease in diseases for param in (disease, self.fts_query([disease]))]
+            try:
+                rows = conn.execute(' UNION ALL '.join([branch] * len(diseases)), params).fetchall()
+            except sqlite3.OperationalError as e:
+                logging.warning(f"FTS disease lookup failed for {diseases!r}: {e}")
         
-        for title, content in mohfw_data.items():
-            keywords = ' '.join([k for keywords_list in self.disease_keywords[self.current_language].values() for k in keywords_list])
-            cursor.execute(
-                "INSERT INTO health_data (source, category, title, content, keywords) VALUES (?, ?, ?, ?, ?)",
-                ('MOHFW', 'advisory', title, content, keywords)
+        if rows is None:
+            branch = (
+                "SELECT * FROM (SELECT ? AS disease, title, content FROM health_data "
+                "WHERE title LIKE ? OR content LIKE ? OR keywords LIKE ? LIMIT 2)"
             )
+            params = [param for disease in diseases for param in (disease, f"%{disease}%", f"%{disease}%", f"%{disease}%")]
+            rows = conn.execute(' UNION ALL '.join([branch] * len(diseases)), params).fetchall()
         
-        self.conn.commit()
-        print(f"{self.translations[self.current_language]['data_loaded']} ({len(who_data) + len(mohfw_data)} articles)")
+        return rows
 
-    def search_health_info(self, query: str) -> List[Tuple]:
-        cursor = self.conn.cursor()
+    def format_disease_info(self, diseases: List[str], articles: Dict[str, List[Tuple]]) -> str:
+        info = ""
         
-        words = query.lower().split()
-        conditions = []
-        params = []
+        for disease in diseases:
+            for title, content in articles.get(disease, []):
+                info += f"\n📋 {title}\n{content[:300]}...\n"
         
-        for word in words:
-            if len(word) > 2:
-                conditions.append("(title LIKE ? OR content LIKE ? OR keywords LIKE ?)")
-                params.extend([f"%{word}%", f"%{word}%", f"%{word}%"])
+        return info
+
+    def set_language(self, language: str, session: ChatSession = None):
+        session = session or self.default_session
         
-        if conditions:
-            query_sql = f"SELECT title, content, source FROM health_data WHERE {' OR '.join(conditions)} ORDER BY last_updated DESC LIMIT 3"
-            cursor.execute(query_sql, params)
-        else:
-            cursor.execute("SELECT title, content, source FROM health_data ORDER BY last_updated DESC LIMIT 3")
+        if language.lower() in ['hindi', 'हिंदी', 'hin', 'hi']:
+            session.language = 'hindi'
+        elif language.lower() in ['english', 'eng', 'en']:
+            session.language = 'english'
         
-        return cursor.fetchall()
+        return self.translations[session.language]['language_set']
 
-    def log_interaction(self, user_input: str, bot_response: str):
-        cursor = self.conn.cursor()
-        cursor.execute(
-            "INSERT INTO user_sessions (user_input, bot_response, language) VALUES (?, ?, ?)",
-            (user_input, bot_response, self.current_language)
+    def get_health_data(self, sources: List[HealthSource] = None):
+        with self.refresh_lock, self.metrics.timed('rhea_refresh_seconds'):
+            now = time.monotonic()
+            sources = list(self.sources.values()) if sources is None else sources
+            if not sources:
+                return
+            
+            print(self.translations[self.current_language]['fetching_data'])
+            
+            # Pull every URL of every source at once, each source within its own timeout and concurrency
+            responses = self.fetcher.fetch_all(
+                self.source_targets(sources),
+                max(source.fetch_budget() for source in sources)
+            )
+            
+            self.corpus_changed = False
+            articles = {}
+            source_status = dict(self.source_status)
+            for source in sources:
+                live_articles = self.fetch_source_live_data(source, responses)
+                self.next_refresh[source.name] = now + source.refresh_interval
+                
+                if live_articles:
+                    articles[source.name] = live_articles
+                    source_status[source.name] = 'live'
+                elif source_status.get(source.name) != 'live':
+                    articles[source.name] = source.get_fallback()
+                    source_status[source.name] = 'fallback'
+                # A source that was live before but failed now keeps its last live articles
+            
+            data_source = 'live' if 'live' in source_status.values() else 'fallback'
+            
+            self.last_refresh_at = time.time()
+            
+            # Every page was revalidated as unchanged, so the stored corpus is already current
+            if not self.corpus_changed and data_source == self.data_source and source_status == self.source_status:
+                print(f"{self.translations[self.current_language]['data_loaded']} ({self.count_articles()} articles)")
+                return
+            
+            changes = self.sync_health_data(articles, data_source, source_status)
+            print(
+                f"{self.translations[self.current_language]['data_loaded']} ({self.count_articles()} articles, "
+                f"{changes['inserted']} new, {changes['updated']} updated, {changes['expired']} expired)"
+            )
+
+    def load_fallback_data(self):
+        self.sync_health_data(
+            {name: source.get_fallback() for name, source in self.sources.items()},
+            'fallback',
+            {name: 'fallback' for name in self.sources}
         )
-        self.conn.commit()
 
-    def get_emergency_keywords(self) -> List[str]:
-        emergency_keywords = {
-            'english': ['emergency', 'urgent', 'severe', 'critical', 'help', 'ambulance', 'hospital', 'emergency room', 'chest pain', 'heart attack', 'stroke', 'bleeding', 'unconscious', 'seizure', 'overdose'],
-            'hindi': ['आपातकाल', 'तत्काल', 'गंभीर', 'एम्बुलेंस', 'अस्पताल', 'छाती दर्द', 'हार्ट अटैक', 'स्ट्रोक', 'खून बहना', 'बेहोश', 'दौरा', 'ओवरडोज']
-        }
-        return emergency_keywords[self.current_language]
+    def refresh_health_data(self) -> bool:
+        # Only the sources whose refresh interval has elapsed are fetched
+        if self.closed:
+            return False
+        
+        try:
+            self.get_health_data(self.due_sources())
+            return self.data_source == 'live'
+        except Exception as e:
+            logging.error(f"Error refreshing health data: {e}")
+            return False
 
-    def check_emergency(self, text: str) -> bool:
-        emergency_keywords = self.get_emergency_keywords()
-        text_lower = text.lower()
+    def publish_snapshot(self) -> bool:
+        # Refresher side: publish the corpus whenever a sync has written a new one
+        if self.snapshot is None or self.closed or self.data_loaded_at is None:
+            return False
         
-        for keyword in emergency_keywords:
-            if keyword.lower() in text_lower:
-                return True
+        with self.refresh_lock:
+            loaded_at = self.data_loaded_at.isoformat()
+            if self.snapshot.published.get('loaded_at') == loaded_at:
+                return False
+            
+            name = self.snapshot.publish(
+                self.db,
+                {'corpus_version': self.corpus_version, 'loaded_at': loaded_at},
+                self.vector_index.path if self.vector_index is not None else None
+            )
+        print(f"Published corpus snapshot {name} (version {self.corpus_version})")
+        return True
+
+    def load_snapshot(self) -> bool:
+        # Worker side: switch to the latest published snapshot, if it is new
+        if self.snapshot is None or self.closed:
+            return False
         
-        emergency_symptoms = ['chest_pain', 'shortness_of_breath']
-        detected_symptoms = self.recognize_symptoms(text)
+        with self.refresh_lock:
+            if not self.snapshot.refresh():
+                return False
+            
+            previous_version = self.corpus_version
+            self.restore_corpus_state()
+            self.last_refresh_at = time.time()
+            if self.vector_index is not None:
+                # The refresher ships its vectors beside the snapshot; without them they are built here
+                vector_index = VectorIndex(self.snapshot.vector_path, self.vector_index.dim)
+                if vector_index.version != self.corpus_version:
+                    vector_index = VectorIndex(None, self.vector_index.dim)
+                self.vector_index = vector_index
+                if vector_index.version != self.corpus_version:
+                    self.rebuild_vector_index()
+            if self.corpus_version != previous_version:
+                self.response_cache.clear()
         
-        return any(symptom in emergency_symptoms for symptom in detected_symptoms)
+        print(f"Loaded corpus snapshot {os.path.basename(self.snapshot.path)} (version {self.corpus_version}, {self.count_articles()} articles)")
+        return True
 
-    def get_emergency_response(self) -> str:
-        if self.current_language == 'hindi':
-            return """🚨 आपातकालीन स्थिति का पता चला!
-
-तत्काल कार्रवाई:
-• 108 (आपातकालीन सेवा) पर कॉल करें
-• 102 (एम्बुलेंस) पर कॉल करें  
-• निकटतम अस्पताल जाएं
-• शांत रहें और घबराएं नहीं
-
-यदि व्यक्ति बेहोश है:
-• सांस की जांच करें
-• रिकवरी पोजिशन में रखें
-• CPR दें यदि आप जानते हैं
+    def sync_health_data(self, articles: Dict[str, Dict], data_source: str, source_status: Dict) -> Dict:
+        # Diff each source's articles against what is stored: insert new titles, update
+        # changed content, and expire titles that vanished upstream. Sources absent from
+        # articles are left untouched. The FTS triggers index only the rows that change.
+        changes = {'inserted': 0, 'updated': 0, 'expired': 0}
+        loaded_at = datetime.now()
+        
+        with self.db.transaction() as conn:
+            for source, source_articles in articles.items():
+                stored = {
+                    title: (article_id, content_hash)
+                    for article_id, title, content_hash in conn.execute(
+                        "SELECT id, title, content_hash FROM health_data WHERE source = ?", (source,)
+                    )
+                }
+                
+                seen_hashes = set()
+                for title, content in source_articles.items():
+                    content_hash = hashlib.sha256(content.encode('utf-8')).hexdigest()
+                    if content_hash in seen_hashes:
+                        continue
+                    seen_hashes.add(content_hash)
+                    
+                    if title not in stored:
+                        tags = self.tag_article(title, content)
+                        cursor = conn.execute(
+                            "INSERT INTO health_data (source, category, title, content, keywords, content_hash) VALUES (?, ?, ?, ?, ?, ?)",
+                            (source, self.sources[source].category if source in self.sources else 'general', title, content, self.tag_keywords(tags), content_hash)
+                        )
+                        self.write_article_tags(conn, cursor.lastrowid, tags)
+                        changes['inserted'] += 1
+                    else:
+                        article_id, stored_hash = stored.pop(title)
+                        if stored_hash != content_hash:
+                            tags = self.tag_article(title, content)
+                            conn.execute(
+                                "UPDATE health_data SET content = ?, keywords = ?, content_hash = ?, last_updated = CURRENT_TIMESTAMP WHERE id = ?",
+                                (content, self.tag_keywords(tags), content_hash, article_id)
+                            )
+                            self.write_article_tags(conn, article_id, tags)
+                            changes['updated'] += 1
+                
+                # Anything left in stored was not seen upstream this time, or was a duplicate
+                for article_id, _ in stored.values():
+                    conn.execute("DELETE FROM health_data WHERE id = ?", (article_id,))
+                    changes['expired'] += 1
+            
+            corpus_changed = any(changes.values())
+            for change, count in changes.items():
+                self.metrics.increment('rhea_corpus_changes_total', count, change=change)
+            corpus_version = self.corpus_version + 1 if corpus_changed else self.corpus_version
+            
+            conn.executemany(
+                "INSERT OR REPLACE INTO corpus_meta (key, value) VALUES (?, ?)",
+                [
+                    ('data_source', data_source),
+                    ('source_status', json.dumps(source_status)),
+                    ('loaded_at', loaded_at.isoformat()),
+                    ('corpus_version', str(corpus_version))
+                ]
+            )
+            self.data_source = data_source
+            self.source_status = source_status
+            self.data_loaded_at = loaded_at
+            self.corpus_version = corpus_version
+        
+        # Cached responses quote the old corpus; the version bump already makes them unreachable
+        if corpus_changed:
+            self.response_cache.clear()
+            if self.vector_index is not None:
+                self.rebuild_vector_index()
+        
+        return changes
 
-⚠️ देरी न करें - तुरंत चिकित्सा सहायता लें!"""
-        else:
-            return """🚨 Emergency situation detected!
+    def synonyms(self, labels: List[Tuple[str, str]]) -> List[str]:
+        # Every keyword, in every language, for the given (kind, label) tags
+        vocabularies = {'symptom': self.symptom_patterns, 'disease': self.disease_keywords}
+        return [
+            keyword
+            for kind, label in labels
+            for patterns in vocabularies[kind].values()
+            for keyword in patterns.get(label, [])
+        ]
 
-Immediate actions:
-• Call 108 (Emergency services)
-• Call 102 (Ambulance)
-• Go to nearest hospital
-• Stay calm and don't panic
+    def expand_query(self, text: str) -> str:
+        # Paraphrases rarely share words with an article, so recognised terms pull in their synonyms
+        tokens = tokenize(text)
+        labels = []
+        for matcher in self.matchers.values():
+            matches = matcher.scan(tokens)
+            labels += [(kind, label) for kind in ('symptom', 'disease') for label in matches.get(kind, [])]
+        return ' '.join([text] + self.synonyms(list(dict.fromkeys(labels))))
 
-If person is unconscious:
-• Check breathing
-• Place in recovery position
-• Give CPR if you know how
+    def rebuild_vector_index(self):
+        with self.corpus_reader() as conn:
+            articles = conn.execute("SELECT id, title, content FROM health_data ORDER BY id").fetchall()
+            tags = {}
+            for article_id, tag_type, tag in conn.execute("SELECT article_id, tag_type, tag FROM article_tags"):
+                tags.setdefault(article_id, []).append((tag_type, tag))
+        
+        # Articles carry their tags' synonyms too, so "throwing up" can reach an article that says "vomiting"
+        documents = [
+            (article_id, ' '.join([title, content] + self.synonyms(tags.get(article_id, []))))
+            for article_id, title, content in articles
+        ]
+        self.vector_index.build(documents, self.corpus_version)
 
-⚠️ Don't delay - seek immediate medical help!"""
+    def count_articles(self) -> int:
+        with self.corpus_reader() as conn:
+            return conn.execute("SELECT COUNT(*) FROM health_data").fetchone()[0]
 
-    def get_help_info(self) -> str:
-        if self.current_language == 'hindi':
-            return """🏥 RHEA की सुविधाएं:
+    def get_readiness(self) -> Dict:
+        return {
+            'ready': self.data_source != 'empty',
+            'corpus': self.data_source,
+            'sources': dict(self.source_status),
+            'articles': self.count_articles(),
+            'loaded_at': self.data_loaded_at.isoformat() if self.data_loaded_at else None
+        }
 
-📍 लक्षण पहचान:
-   "मुझे बुखार और सिर दर्द है" टाइप करें
+    @timed_stage('search')
+    def search_health_info(self, query: str) -> List[Tuple]:
+        with self.corpus_reader() as conn:
+            words = [word for word in query.lower().split() if len(word) > 2]
+            
+            if not words:
+                return conn.execute("SELECT title, content, source FROM health_data ORDER BY last_updated DESC LIMIT 3").fetchall()
+            
+            if self.vector_index is None:
+                return [row[1:] for row in self.keyword_search(conn, words, query, 3)]
+            
+            # Both retrievers see the synonyms, so a paraphrase is not outvoted by a stray word match
+            expanded = self.expand_query(query)
+            keyword_rows = self.keyword_search(conn, [word for word in expanded.lower().split() if len(word) > 2], expanded, 10)
+            vector_hits = self.vector_index.search(expanded, 10, self.vector_min_score)
+            return self.blend_results(conn, [row[0] for row in keyword_rows], [article_id for article_id, _ in vector_hits])
 
-📍 बीमारी की जानकारी:
-   "डायबिटीज के बारे में बताएं" पूछें
+    def keyword_search(self, conn: sqlite3.Connection, words: List[str], query: str, limit: int) -> List[Tuple]:
+        cursor = conn.cursor()
+        
+        if self.fts_enabled:
+            try:
+                cursor.execute(
+                    "SELECT h.id, h.title, h.content, h.source FROM health_data_fts JOIN health_data h ON h.id = health_data_fts.rowid "
+                    "WHERE health_data_fts MATCH ? ORDER BY bm25(health_data_fts, 10.0, 1.0, 0.5) LIMIT ?",
+                    (self.fts_query(words), limit)
+                )
+                return cursor.fetchall()
+            except sqlite3.OperationalError as e:
+                logging.warning(f"FTS search failed for {query!r}, falling back to LIKE: {e}")
+        
+        conditions = []
+        params = []
+        
+        for word in words:
+            conditions.append("(title LIKE ? OR content LIKE ? OR keywords LIKE ?)")
+            params.extend([f"%{word}%", f"%{word}%", f"%{word}%"])
+        
+        query_sql = f"SELECT id, title, content, source FROM health_data WHERE {' OR '.join(conditions)} ORDER BY last_updated DESC LIMIT ?"
+        cursor.execute(query_sql, params + [limit])
+        return cursor.fetchall()
 
-📍 स्वास्थ्य सलाह:
-   WHO और MOHFW से वास्तविक डेटा
+    def blend_results(self, conn: sqlite3.Connection, keyword_ids: List[int], vector_ids: List[int], limit: int = 3) -> List[Tuple]:
+        # Reciprocal rank fusion: an article ranked highly by either retriever surfaces,
+        # and one both agree on comes first
+        scores = {}
+        for ranking in (keyword_ids, vector_ids):
+            for rank, article_id in enumerate(ranking):
+                scores[article_id] = scores.get(article_id, 0.0) + 1.0 / (60 + rank)
+        
+        top = sorted(scores, key=lambda article_id: -scores[article_id])[:limit]
+        if not top:
+            return []
+        
+        rows = conn.execute(
+            f"SELECT id, title, content, source FROM health_data WHERE id IN ({', '.join('?' * len(top))})", top
+        ).fetchall()
+        by_id = {row[0]: row[1:] for row in rows}
+        return [by_id[article_id] for article_id in top if article_id in by_id]
 
-📍 आपातकालीन मदद:
-   गंभीर लक्षणों की पहचान
+    def log_interaction(self, user_input: str, bot_response: str, language: str = None):
+        self.interaction_logger.log(user_input, bot_response, language or self.current_language)
 
-📍 भाषा बदलें:
-   'english' टाइप करें
+    def get_emergency_keywords(self, language: str = None) -> Tuple[str, ...]:
+        return self.knowledge[language or self.current_language]['emergency_keywords']
 
-⚠️ यह केवल जानकारी के लिए है। गंभीर समस्याओं के लिए डॉक्टर से मिलें।"""
-        else:
-            return """🏥 RHEA Features:
+    def check_emergency(self, text: str, language: str = None) -> bool:
+        return self.is_emergency(self.analyze_message(text, language))
 
-📍 Symptom Recognition:
-   Type "I have fever and headache"
+    def is_emergency(self, analysis: Dict) -> bool:
+        if analysis['emergency_keywords']:
+            return True
+        
+        return any(symptom in self.EMERGENCY_SYMPTOMS for symptom in analysis['symptoms'])
 
-📍 Disease Information:
-   Ask "Tell me about diabetes"
+    def get_emergency_response(self, language: str = None) -> str:
+        return self.knowledge[language or self.current_language]['emergency_response']
 
-📍 Health Advice:
-   Real data from WHO and MOHFW
+    def get_help_info(self, language: str = None) -> str:
+        return self.knowledge[language or self.current_language]['help_info']
 
-📍 Emergency Help:
-   Identifies critical symptoms
+    @timed_stage('log')
+    def record_interaction(self, session: ChatSession, message: str, response: str):
+        session.history.append((message, response))
+        self.log_interaction(message, response, session.language)
 
-📍 Language Switch:
-   Type 'hindi' to switch
+    async def record_interaction_async(self, session: ChatSession, message: str, response: str):
+        session.history.append((message, response))
+        with self.metrics.timed('rhea_stage_seconds', stage='log'):
+            await self.interaction_logger.log_async(message, response, session.language)
 
-⚠️ This is for information only. See a doctor for serious problems."""
+    async def run_db(self, func, *args):
+        # SQLite calls block, so they run on a small dedicated pool instead of the event loop
+        return await asyncio.get_running_loop().run_in_executor(self.db_executor, partial(func, *args))
 
-    def process_message(self, message: str) -> str:
+    @timed_stage('route')
+    def route_message(self, message: str, session: ChatSession) -> Dict:
+        # Everything that can be answered without a database lookup: commands, cached
+        # responses, emergencies and greetings. 'response' is None when lookups are needed.
+        language = session.language
         message_lower = message.lower().strip()
         
         if not message_lower:
-            return self.translations[self.current_language]['help_message']
+            return {'response': self.translations[language]['help_message'], 'log': False}
         
         if message_lower in ['help', 'मदद', '?', 'commands', 'options']:
-            return self.get_help_info()
-        
-        if any(word in message_lower for word in ['hindi', 'हिंदी', 'भाषा बदलो', 'हिन्दी']):
-            response = self.set_language('hindi')
-            self.log_interaction(message, response)
-            return response
-        elif any(word in message_lower for word in ['english', 'अंग्रेजी', 'english me']):
-            response = self.set_language('english')
-            self.log_interaction(message, response)
-            return response
-        
-        if self.check_emergency(message):
-            response = self.get_emergency_response()
-            self.log_interaction(message, response)
-            return response
-        
-        if any(word in message_lower for word in ['hello', 'hi', 'hey', 'नमस्ते', 'हैलो', 'start', 'शुरू']):
-            response = self.translations[self.current_language]['greeting']
-            self.log_interaction(message, response)
-            return response
-        
-        symptoms = self.recognize_symptoms(message)
-        diseases = self.recognize_diseases(message)
+            return {'response': self.get_help_info(language), 'log': False}
+        
+        tokens = tokenize(message)
+        cache_key = (' '.join(tokens), language, self.corpus_version)
+        
+        response = self.response_cache.get(cache_key)
+        if response is not None:
+            return {'response': response, 'log': True, 'language': language}
+        
+        analysis = self.analyze_tokens(tokens, language)
+        
+        # Language switches change the session, so they are never served from the cache
+        if analysis['language_switch']:
+            response = self.set_language(analysis['language_switch'], session)
+            return {'response': response, 'log': True, 'language': session.language}
+        
+        if self.is_emergency(analysis):
+            response = self.get_emergency_response(language)
+            self.response_cache.put(cache_key, response)
+            return {'response': response, 'log': True, 'language': language}
+        
+        if analysis['greeting']:
+            response = self.translations[language]['greeting']
+            self.response_cache.put(cache_key, response)
+            return {'response': response, 'log': True, 'language': language}
+        
+        return {
+            'response': None,
+            'log': True,
+            'language': language,
+            'analysis': analysis,
+            'cache_key': cache_key,
+            'needs_disease_info': bool(analysis['diseases']),
+            'needs_search': not analysis['symptoms'] and not analysis['diseases']
+        }
+
+    @timed_stage('symptom_advice')
+    def symptom_section(self, route: Dict) -> List[str]:
+        language = route['language']
+        symptoms = route['analysis']['symptoms']
         
         response_parts = []
         
         if symptoms:
-            response_parts.append(f"{self.translations[self.current_language]['symptoms_found']}")
-            advice, is_emergency = self.get_symptom_advice(symptoms)
+            response_parts.append(f"{self.translations[language]['symptoms_found']}")
+            advice, is_emergency = self.get_symptom_advice(symptoms, language)
             
             if is_emergency:
-                response_parts.append(f"\n{self.translations[self.current_language]['emergency']}\n")
+                response_parts.append(f"\n{self.translations[language]['emergency']}\n")
             
-            response_parts.append(f"\n{self.translations[self.current_language]['recommendations']}")
+            response_parts.append(f"\n{self.translations[language]['recommendations']}")
             
             for symptom, advice_text in advice.items():
                 symptom_display = symptom.replace('_', ' ').title()
                 response_parts.append(f"\n🔸 {symptom_display}:\n   {advice_text}")
             
-            response_parts.append(f"\n\n{self.translations[self.current_language]['consult_doctor']}")
+            response_parts.append(f"\n\n{self.translations[language]['consult_doctor']}")
         
-        if diseases:
-            disease_info = self.get_disease_info(diseases)
-            if disease_info:
-                response_parts.append(f"\n\n📚 Disease Information:")
-                response_parts.append(disease_info)
+        return response_parts
+
+    def disease_section(self, route: Dict, disease_info: str) -> List[str]:
+        if route['analysis']['diseases'] and disease_info:
+            return [f"\n\n📚 Disease Information:", disease_info]
+        return []
+
+    def search_section(self, route: Dict, search_results: List[Tuple]) -> List[str]:
+        if not route['needs_search']:
+            return []
         
-        if not symptoms and not diseases:
-            search_results = self.search_health_info(message)
-            if search_results:
-                if self.current_language == 'hindi':
-                    response_parts.append("यहां मुझे जो जानकारी मिली है:\n")
-                else:
-                    response_parts.append("Here's what I found:\n")
-                
-                for i, (title, content, source) in enumerate(search_results, 1):
-                    response_parts.append(f"\n📋 {i}. {title} ({source})")
-                    response_parts.append(f"   {content[:250]}...")
-                    if i < len(search_results):
-                        response_parts.append("")
-            else:
-                response_parts.append(self.translations[self.current_language]['no_symptoms'])
+        if not search_results:
+            return [self.translations[route['language']]['no_symptoms']]
         
-        if response_parts:
-            response_parts.append(f"\n{self.translations[self.current_language]['disclaimer']}")
-            response = '\n'.join(response_parts)
+        if route['language'] == 'hindi':
+            response_parts = ["यहां मुझे जो जानकारी मिली है:\n"]
         else:
-            response = self.translations[self.current_language]['error']
+            response_parts = ["Here's what I found:\n"]
+        
+        for i, (title, content, source) in enumerate(search_results, 1):
+            response_parts.append(f"\n📋 {i}. {title} ({source})")
+            response_parts.append(f"   {content[:250]}...")
+            if i < len(search_results):
+                response_parts.append("")
+        
+        return response_parts
+
+    def closing_section(self, route: Dict, has_content: bool) -> List[str]:
+        if has_content:
+            return [f"\n{self.translations[route['language']]['disclaimer']}"]
+        return [self.translations[route['language']]['error']]
+
+    @timed_stage('compose')
+    def compose_response(self, route: Dict, disease_info: str, search_results: List[Tuple]) -> str:
+        response_parts = self.symptom_section(route)
+        response_parts += self.disease_section(route, disease_info)
+        response_parts += self.search_section(route, search_results)
+        response_parts += self.closing_section(route, bool(response_parts))
         
-        self.log_interaction(message, response)
+        response = '\n'.join(response_parts)
+        self.response_cache.put(route['cache_key'], response)
         return response
 
-    def get_statistics(self) -> Dict:
-        cursor = self.conn.cursor()
+    def stream_chunk(self, response_parts: List[str], section: List[str]) -> str:
+        # Chunks concatenate to exactly the '\n'.join of every part, as process_message returns
+        chunk = '\n'.join(section)
+        if response_parts:
+            chunk = '\n' + chunk
+        response_parts.extend(section)
+        return chunk
+
+    @timed_stage('compose')
+    def finish_stream(self, route: Dict, response_parts: List[str]) -> str:
+        response = '\n'.join(response_parts)
+        self.response_cache.put(route['cache_key'], response)
+        return response
+
+    def stream_message(self, message: str, session: ChatSession = None) -> Iterator[str]:
+        # Yields each section as soon as it is ready; symptom advice and emergency
+        # warnings go out before the disease and search lookups run
+        session = session or self.default_session
+        route = self.route_message(message, session)
+        
+        if route['response'] is not None:
+            if route['log']:
+                self.record_interaction(session, message, route['response'])
+            yield route['response']
+            return
+        
+        response_parts = []
+        
+        section = self.symptom_section(route)
+        if section:
+            yield self.stream_chunk(response_parts, section)
+        
+        if route['needs_disease_info']:
+            section = self.disease_section(route, self.get_disease_info(route['analysis']['diseases']))
+            if section:
+                yield self.stream_chunk(response_parts, section)
+        
+        if route['needs_search']:
+            section = self.search_section(route, self.search_health_info(message))
+            if section:
+                yield self.stream_chunk(response_parts, section)
+        
+        yield self.stream_chunk(response_parts, self.closing_section(route, bool(response_parts)))
+        self.record_interaction(session, message, self.finish_stream(route, response_parts))
+
+    async def stream_message_async(self, message: str, session: ChatSession = None) -> AsyncIterator[str]:
+        session = session or self.default_session
+        route = self.route_message(message, session)
+        
+        if route['response'] is not None:
+            if route['log']:
+                await self.record_interaction_async(session, message, route['response'])
+            yield route['response']
+            return
         
-        cursor.execute("SELECT COUNT(*) FROM user_sessions")
-        total_queries = cursor.fetchone()[0]
+        response_parts = []
+        
+        section = self.symptom_section(route)
+        if section:
+            yield self.stream_chunk(response_parts, section)
+        
+        if route['needs_disease_info']:
+            disease_info = await self.run_db(self.get_disease_info, route['analysis']['diseases'])
+            section = self.disease_section(route, disease_info)
+            if section:
+                yield self.stream_chunk(response_parts, section)
+        
+        if route['needs_search']:
+            search_results = await self.run_db(self.search_health_info, message)
+            section = self.search_section(route, search_results)
+            if section:
+                yield self.stream_chunk(response_parts, section)
+        
+        yield self.stream_chunk(response_parts, self.closing_section(route, bool(response_parts)))
+        await self.record_interaction_async(session, message, self.finish_stream(route, response_parts))
+
+    def process_message(self, message: str, session: ChatSession = None) -> str:
+        with self.metrics.timed('rhea_message_seconds', mode='sync'):
+            return ''.join(self.stream_message(message, session))
+
+    @timed_stage('batch')
+    def process_messages(self, messages: List[str], session: ChatSession = None) -> List[str]:
+        session = session or self.default_session
+        
+        # Routing runs in order because a language switch applies to the messages after it
+        routes = [self.route_message(message, session) for message in messages]
+        pending = [(message, route) for message, route in zip(messages, routes) if route['response'] is None]
         
-        cursor.execute("SELECT language, COUNT(*) FROM user_sessions GROUP BY language")
-        language_stats = dict(cursor.fetchall())
+        diseases = [disease for _, route in pending if route['needs_disease_info'] for disease in route['analysis']['diseases']]
+        articles = self.get_disease_articles(diseases)
         
-        cursor.execute("SELECT COUNT(*) FROM health_data")
-        total_articles = cursor.fetchone()[0]
+        composed = {}
+        for message, route in pending:
+            cache_key = route['cache_key']
+            if cache_key not in composed:
+                disease_info = self.format_disease_info(route['analysis']['diseases'], articles) if route['needs_disease_info'] else ""
+                search_results = self.search_health_info(message) if route['needs_search'] else []
+                composed[cache_key] = self.compose_response(route, disease_info, search_results)
+            route['response'] = composed[cache_key]
         
-        cursor.execute("SELECT source, COUNT(*) FROM health_data GROUP BY source")
-        source_stats = dict(cursor.fetchall())
+        interactions = []
+        for message, route in zip(messages, routes):
+            if route['log']:
+                session.history.append((message, route['response']))
+                interactions.append((message, route['response'], route['language']))
+        
+        if interactions:
+            self.interaction_logger.log_many(interactions)
+        
+        return [route['response'] for route in routes]
+
+    async def process_message_async(self, message: str, session: ChatSession = None) -> str:
+        with self.metrics.timed('rhea_message_seconds', mode='async'):
+            return ''.join([chunk async for chunk in self.stream_message_async(message, session)])
+
+    def get_statistics(self, flush: bool = True) -> Dict:
+        if flush:
+            self.interaction_logger.flush()
+        
+        # Query counts live with the logs, article counts with the corpus, which may be a snapshot
+        with self.db.reader() as conn:
+            language_stats = dict(conn.execute("SELECT key, value FROM stats_counters WHERE name = 'queries' AND value > 0").fetchall())
+        with self.corpus_reader() as conn:
+            source_stats = dict(conn.execute("SELECT key, value FROM stats_counters WHERE name = 'articles' AND value > 0").fetchall())
         
         return {
-            'total_queries': total_queries,
+            'total_queries': sum(language_stats.values()),
             'language_stats': language_stats,
-            'total_articles': total_articles,
+            'total_articles': sum(source_stats.values()),
             'source_stats': source_stats
         }
 
+    def render_metrics(self, gauges: List[Tuple] = None) -> str:
+        # Scrape-time samples; a scrape does not wait for queued interaction logs to be written
+        statistics = self.get_statistics(flush=False)
+        cache = self.response_cache.stats()
+        gauges = list(gauges or [])
+        
+        gauges += [
+            ('rhea_corpus_articles', 'Articles in the corpus by source', (('source', source),), count)
+            for source, count in statistics['source_stats'].items()
+        ]
+        gauges += [
+            ('rhea_source_live', '1 when the source is serving live data, 0 for fallback', (('source', source),), int(status == 'live'))
+            for source, status in self.source_status.items()
+        ]
+        gauges += [
+            ('rhea_corpus_version', 'Version of the loaded corpus', (), self.corpus_version),
+            ('rhea_response_cache_entries', 'Responses held in the cache', (), cache['size']),
+            ('rhea_response_cache_hit_ratio', 'Response cache hits over lookups', (), round(cache['hit_rate'], 4)),
+            ('rhea_log_queue_depth', 'Interaction logs waiting to be written', (), self.interaction_logger.queue.qsize())
+        ]
+        if self.last_refresh_at is not None:
+            gauges.append(('rhea_refresh_age_seconds', 'Seconds since the last completed refresh', (), round(time.time() - self.last_refresh_at, 3)))
+        if self.data_loaded_at is not None:
+            gauges.append(('rhea_corpus_age_seconds', 'Seconds since the corpus last changed', (), round((datetime.now() - self.data_loaded_at).total_seconds(), 3)))
+        
+        counters = [
+            ('rhea_queries_total', 'Logged queries by language', (('language', language),), count)
+            for language, count in statistics['language_stats'].items()
+        ]
+        counters += [
+            ('rhea_response_cache_hits_total', 'Response cache hits', (), cache['hits']),
+            ('rhea_response_cache_misses_total', 'Response cache misses', (), cache['misses']),
+            ('rhea_log_dropped_total', 'Interaction logs dropped because the queue was full', (), self.interaction_logger.dropped)
+        ]
+        
+        return self.metrics.render(gauges, counters)
+
+    def close(self):
+        self.closed = True
+        self.interaction_logger.close()
+        self.fetcher.close()
+        if self.parse_executor is not None:
+            self.parse_executor.shutdown(wait=True)
+        
+        # Let an in-flight refresh finish its write before the connections go away
+        with self.refresh_lock:
+            self.db_executor.shutdown(wait=True)
+            self.db.close()
+            if self.snapshot is not None:
+                self.snapshot.close()
+
 def print_banner():
     banner = """
 ╔═══════════════════════════════════════════════════════════════════════════════╗
@@ -737,6 +2772,33 @@ def main():
             }
             print(error_msg[bot.current_language])
             continue
+    
+    bot.close()
+
+def run_refresher():
+    # Snapshot mode's single scraper: refetch each source on its cadence and publish every
+    # new corpus to RHEA_SNAPSHOT_DIR for the API workers
+    snapshot_dir = os.environ.get('RHEA_SNAPSHOT_DIR')
+    if not snapshot_dir:
+        print("❌ --refresher needs RHEA_SNAPSHOT_DIR")
+        return
+    
+    bot = RHEAHealthBot(db_path=os.path.join(snapshot_dir, 'corpus.db'))
+    
+    try:
+        # Workers can serve the fallback corpus while the first scrape runs
+        if bot.data_source == 'empty':
+            bot.load_fallback_data()
+        bot.publish_snapshot()
+        
+        while True:
+            bot.refresh_health_data()
+            bot.publish_snapshot()
+            time.sleep(max(1.0, bot.next_refresh_delay()))
+    except KeyboardInterrupt:
+        print("\n🛑 Refresher stopped")
+    finally:
+        bot.close()
 
 if __name__ == "__main__":
     logging.basicConfig(
@@ -749,7 +2811,10 @@ if __name__ == "__main__":
     )
     
     try:
-        main()
+        if '--refresher' in sys.argv[1:]:
+            run_refresher()
+        else:
+            main()
     except Exception as e:
         print(f"\n💥 Critical error: {e}")
         print("🔧 Please check your internet connection and try again.")
@@ -0,0 +1,76 @@
+import importlib.util
+import os
+import sys
+
+import pytest
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def load_chatbot_module():
+    # backend.py imports rhea_python_chatbot; the module lives in rhea-python-chatbot.py
+    if 'rhea_python_chatbot' in sys.modules:
+        return sys.modules['rhea_python_chatbot']
+    spec = importlib.util.spec_from_file_location(
+        'rhea_python_chatbot', os.path.join(BACKEND_DIR, 'rhea-python-chatbot.py')
+    )
+    module = importlib.util.module_from_spec(spec)
+    sys.modules['rhea_python_chatbot'] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+@pytest.fixture(scope='module')
+def bot():
+    bot = load_chatbot_module().RHEAHealthBot(db_path=':memory:')
+    yield bot
+    bot.close()
+
+
+@pytest.mark.parametrize('message', [
+    'how to stop mosquito breeding',
+    'are there clinical trials for dengue',
+])
+def test_ordinary_words_do_not_trigger_emergency(bot, message):
+    analysis = bot.analyze_message(message, 'english')
+    assert not bot.is_emergency(analysis)
+
+
+def test_ordinary_words_do_not_switch_language(bot):
+    session = load_chatbot_module().ChatSession('hindu')
+    bot.process_message('I am hindu, what diet', session)
+    assert session.language == 'english'
+
+
+def test_ordinary_words_are_not_greetings(bot):
+    assert not bot.analyze_message("what's the smart way to eat", 'english')['greeting']
+
+
+@pytest.mark.parametrize('message, symptom', [
+    ('I never smoke', 'fever'),
+    ('fewer cases', 'fever'),
+    ('a rough week', 'cough'),
+    ('a tough week', 'cough'),
+    ('laughing a lot', 'cough'),
+    ('touching base', 'cough'),
+    ('I got fired', 'fatigue'),
+    ('check my spelling please', 'swelling'),
+    ('I keep smelling smoke', 'swelling'),
+    ('the show aired last night', 'fatigue'),
+    ('tiered pricing', 'fatigue'),
+    ('do not sever the cord', 'fever'),
+    ('skinning a chicken', 'dizziness'),
+    ('pinning the poster', 'dizziness'),
+])
+def test_ordinary_words_are_not_symptoms(bot, message, symptom):
+    assert symptom not in bot.analyze_message(message, 'english')['symptoms']
+
+
+@pytest.mark.parametrize('message, symptom', [
+    ('I have a feaver', 'fever'),
+    ('bad hedache since morning', 'headache'),
+    ('diarhea for two days', 'diarrhea'),
+])
+def test_misspelt_symptoms_are_still_recognised(bot, message, symptom):
+    pytest.importorskip('wordfreq')
+    assert symptom in bot.analyze_message(message, 'english')['symptoms']
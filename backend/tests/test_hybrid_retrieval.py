@@ -0,0 +1,57 @@
+import importlib.util
+import os
+import sys
+
+import pytest
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def load_chatbot_module():
+    # backend.py imports rhea_python_chatbot; the module lives in rhea-python-chatbot.py
+    if 'rhea_python_chatbot' in sys.modules:
+        return sys.modules['rhea_python_chatbot']
+    spec = importlib.util.spec_from_file_location(
+        'rhea_python_chatbot', os.path.join(BACKEND_DIR, 'rhea-python-chatbot.py')
+    )
+    module = importlib.util.module_from_spec(spec)
+    sys.modules['rhea_python_chatbot'] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+@pytest.fixture(scope='module')
+def bot():
+    pytest.importorskip('numpy')
+    with pytest.MonkeyPatch.context() as patch:
+        patch.setenv('RHEA_RETRIEVAL', 'hybrid')
+        patch.delenv('RHEA_VECTOR_DIM', raising=False)
+        patch.delenv('RHEA_VECTOR_MIN_SCORE', raising=False)
+        bot = load_chatbot_module().RHEAHealthBot(db_path=':memory:')
+    bot.load_fallback_data()
+    yield bot
+    bot.close()
+
+
+@pytest.mark.parametrize('message', ['blorp', 'xyzzy plugh', 'qwerty asdf'])
+def test_gibberish_gets_no_match_reply(bot, message):
+    session = load_chatbot_module().ChatSession('gibberish')
+    reply = bot.process_message(message, session)
+    assert reply.startswith(bot.translations['english']['no_symptoms'])
+    assert "Here's what I found" not in reply
+
+
+@pytest.mark.parametrize('message', ['blorp', 'xyzzy plugh', 'what time is it', 'weather in delhi tomorrow'])
+def test_unrelated_questions_get_no_vector_hits(bot, message):
+    assert bot.vector_index.search(bot.expand_query(message), 10, bot.vector_min_score) == []
+
+
+def test_paraphrase_finds_nausea_or_food_safety_article(bot):
+    with bot.db.reader() as conn:
+        expected = {title for (title,) in conn.execute(
+            "SELECT title FROM health_data h JOIN article_tags t ON t.article_id = h.id WHERE t.tag = 'nausea'"
+        )}
+    expected.add('Food Safety Guidelines')
+
+    results = bot.search_health_info('my kid keeps throwing up after eating')
+    assert results and results[0][0] in expected